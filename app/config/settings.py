@@ -48,9 +48,24 @@ class Settings(BaseSettings):
     # SMTP Configuration
     smtp_server: str = Field('smtp.gmail.com', alias='SMTP_SERVER')
     smtp_port: int = Field(587, alias='SMTP_PORT')
+    # Per-phase timeouts (seconds) so a stalled peer triggers a retry
+    smtp_connect_timeout: float = Field(10, alias='SMTP_CONNECT_TIMEOUT')
+    smtp_login_timeout: float = Field(10, alias='SMTP_LOGIN_TIMEOUT')
+    smtp_send_timeout: float = Field(20, alias='SMTP_SEND_TIMEOUT')
     
     # Groq API Configuration
     groq_api_key: str = Field(..., alias='GROQ_API_KEY')
+    groq_model: str = Field('llama-3.1-8b-instant', alias='GROQ_MODEL')
+    # Larger model retried only when the primary model's reply is unparseable
+    # (e.g. llama-3.3-70b-versatile); empty disables the fallback
+    groq_model_fallback: str = Field('', alias='GROQ_MODEL_FALLBACK')
+    # Emails analyzed per LLM call when requests arrive together (1 = off)
+    analysis_batch_size: int = Field(1, alias='ANALYSIS_BATCH_SIZE')
+    # Client-side cap on Groq requests per second (0 = only honor 429 cooldowns)
+    groq_rps: float = Field(0, alias='GROQ_RPS')
+    # Regions tried in order for phone numbers written without a country
+    # code (comma-separated); numbers starting with '+' are parsed once
+    phone_regions: str = Field('US,GB,IN,CA,AU', alias='PHONE_REGIONS')
     
     # Database Configuration
     database_url: str = Field(..., alias='DATABASE_URL')
@@ -115,6 +130,16 @@ class Settings(BaseSettings):
             self.gmail_account_3_email
         ]
 
+    
+    @property
+    def phone_region_list(self) -> tuple[str, ...]:
+        """Get phone region hints in the order they are tried."""
+        return tuple(
+            region.strip().upper()
+            for region in self.phone_regions.split(',')
+            if region.strip()
+        )
+
 
 # Global settings instance
 settings = Settings()
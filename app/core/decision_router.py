@@ -23,6 +23,9 @@ from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Sentinel for "caller did not look the thread up"; None means "looked up, not found"
+_NOT_LOADED = object()
+
 
 class Action(Enum):
     """Possible actions the decision router can take."""
@@ -51,7 +54,8 @@ class DecisionRouter:
     async def determine_action(
         self,
         message_id: str,
-        email_body: str
+        email_body: str,
+        existing_thread: Optional[Dict] = _NOT_LOADED
     ) -> Dict[str, any]:
         """
         Determine what action to take for an email thread.
@@ -63,6 +67,8 @@ class DecisionRouter:
         Args:
             message_id: Unique Gmail message ID
             email_body: Email text to analyze
+            existing_thread: Thread record the caller already fetched (None if
+                it does not exist); looked up in the database if not given
             
         Returns:
             Dict containing:
@@ -77,7 +83,8 @@ class DecisionRouter:
         intent = analysis['intent']
         has_contact = analysis['has_phone'] or analysis['has_address']
         
-        existing_thread = await db.get_thread(message_id)
+        if existing_thread is _NOT_LOADED:
+            existing_thread = await db.get_thread(message_id)
         
         if existing_thread:
             logger.info(
@@ -330,22 +337,28 @@ class DecisionRouter:
         return success
 
 
+# Global router instance (stateless, safe to share)
+_router = DecisionRouter()
+
+
 async def route_email(
     message_id: str,
-    email_body: str
+    email_body: str,
+    existing_thread: Optional[Dict] = _NOT_LOADED
 ) -> Dict[str, any]:
     """
     Convenience function to route a single email.
     
-    Creates a router instance and determines the appropriate action.
+    Uses the shared router instance to determine the appropriate action.
     Uses unified LLM analysis for efficiency (single API call).
     
     Args:
         message_id: Unique Gmail message ID
         email_body: Email text to analyze
+        existing_thread: Thread record the caller already fetched (None if
+            it does not exist); looked up in the database if not given
         
     Returns:
         Decision dict with action, reason, update_fields, and analysis
     """
-    router = DecisionRouter()
-    return await router.determine_action(message_id, email_body)
+    return await _router.determine_action(message_id, email_body, existing_thread)
@@ -38,6 +38,7 @@ class FollowUpScheduler:
     CHECK_INTERVAL_SECONDS = 900  # 15 minutes
     STAGE_2_DELAY_HOURS = 24  # 1 day after Stage 1
     STAGE_3_DELAY_HOURS = 48  # 2 days after Stage 2
+    VALID_STAGES = frozenset({1, 2, 3})
     DEDUP_KEY_TTL_SECONDS = 3600  # 1 hour
     
     def __init__(self):
@@ -111,7 +112,7 @@ class FollowUpScheduler:
         """
         self._ensure_connected()
         
-        if stage not in [1, 2, 3]:
+        if stage not in self.VALID_STAGES:
             raise ValueError(f"Invalid stage: {stage}. Must be 1, 2, or 3")
         
         # Calculate when to send (epoch timestamp)
@@ -158,22 +159,18 @@ class FollowUpScheduler:
         """
         self._ensure_connected()
         
-        cancelled_count = 0
+        stages = [1, 2, 3]
         
         try:
-            # Remove all stages (1, 2, 3) from sorted set
-            for stage in [1, 2, 3]:
-                member = f"{message_id}:{stage}"
-                removed = await self.redis_client.zrem(
-                    self.FOLLOWUP_SORTED_SET,
-                    member
-                )
-                if removed:
-                    cancelled_count += removed
-                
-                # Delete deduplication key
-                dedup_key = f"followup:{message_id}:{stage}"
-                await self.redis_client.delete(dedup_key)
+            # Remove all stages from the sorted set and delete their
+            # deduplication keys in a single round trip
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.zrem(
+                self.FOLLOWUP_SORTED_SET,
+                *[f"{message_id}:{stage}" for stage in stages]
+            )
+            pipe.delete(*[f"followup:{message_id}:{stage}" for stage in stages])
+            cancelled_count, _ = await pipe.execute()
             
             if cancelled_count > 0:
                 logger.info(
@@ -194,7 +191,8 @@ class FollowUpScheduler:
         Get follow-ups that are due to be sent now.
         
         Atomically fetches and removes items from sorted set using ZRANGEBYSCORE
-        and ZREM to prevent duplicate processing.
+        and ZREMRANGEBYSCORE in one MULTI/EXEC round trip to prevent duplicate
+        processing.
         
         Returns:
             List of (message_id, stage) tuples ready to send
@@ -211,22 +209,24 @@ class FollowUpScheduler:
             # Get all items with score <= now (due for sending)
             # ZRANGEBYSCORE returns items in ascending order by score
             # Use "-inf" instead of 0 to handle any valid timestamp
-            items = await self.redis_client.zrangebyscore(
+            # Remove the same range in the same transaction so other scheduler
+            # instances can never pop the same items
+            pipe = self.redis_client.pipeline(transaction=True)
+            pipe.zrangebyscore(
                 self.FOLLOWUP_SORTED_SET,
                 min="-inf",
                 max=now
             )
+            pipe.zremrangebyscore(
+                self.FOLLOWUP_SORTED_SET,
+                min="-inf",
+                max=now
+            )
+            items, _ = await pipe.execute()
             
             if not items:
                 return []
             
-            # Atomically remove items from sorted set
-            # This prevents other scheduler instances from processing same items
-            await self.redis_client.zrem(
-                self.FOLLOWUP_SORTED_SET,
-                *items
-            )
-            
             # Parse "message_id:stage" format
             followups = []
             for item in items:
@@ -330,26 +330,26 @@ class FollowUpScheduler:
         # All checks passed
         return (True, thread)
     
-    async def _process_followup(
+    async def _prepare_followup(
         self,
         message_id: str,
         stage: int
-    ) -> bool:
+    ) -> Optional[Dict]:
         """
-        Process a single follow-up: check eligibility and send.
+        Check a due follow-up's eligibility and claim it for sending.
         
         Args:
             message_id: Unique Gmail message ID
             stage: Follow-up stage to send (1, 2, or 3)
             
         Returns:
-            True if sent successfully, False otherwise
+            Thread data to send with, or None if it should not be sent
         """
         # Check if should send
         should_send, thread_data = await self._should_send_followup(message_id, stage)
         
         if not should_send:
-            return False
+            return None
         
         # Set deduplication key before sending
         dedup_key = f"followup:{message_id}:{stage}"
@@ -359,13 +359,31 @@ class FollowUpScheduler:
             "1"
         )
         
-        # Send follow-up
         logger.info(
             f"Sending Stage {stage} follow-up for thread {message_id}"
         )
         
-        success = await sender.send_followup(thread_data, stage)
+        return thread_data
+    
+    async def _complete_followup(
+        self,
+        message_id: str,
+        stage: int,
+        thread_data: Dict,
+        success: bool
+    ) -> bool:
+        """
+        Record a follow-up's send result and schedule the next stage.
         
+        Args:
+            message_id: Unique Gmail message ID
+            stage: Follow-up stage that was sent
+            thread_data: Thread data the follow-up was sent with
+            success: Whether the send succeeded
+            
+        Returns:
+            True if sent successfully, False otherwise
+        """
         if success:
             # Update current_stage in database
             await db.update_thread(
@@ -429,12 +447,28 @@ class FollowUpScheduler:
             logger.debug("No due follow-ups found")
             return 0
         
-        # Process each follow-up
-        sent_count = 0
+        # Check eligibility and claim each follow-up
+        to_send = []
         for message_id, stage in due_followups:
             try:
-                success = await self._process_followup(message_id, stage)
-                if success:
+                thread_data = await self._prepare_followup(message_id, stage)
+                if thread_data:
+                    to_send.append((message_id, stage, thread_data))
+            except Exception as e:
+                logger.error(
+                    f"Error processing follow-up for {message_id} Stage {stage}: {e}",
+                    exc_info=True
+                )
+        
+        # Send them all in one go so each account reuses its pooled SMTP sessions
+        results = await sender.send_followups_bulk(
+            [(thread_data, stage) for _, stage, thread_data in to_send]
+        )
+        
+        sent_count = 0
+        for (message_id, stage, thread_data), success in zip(to_send, results):
+            try:
+                if await self._complete_followup(message_id, stage, thread_data, success):
                     sent_count += 1
             except Exception as e:
                 logger.error(
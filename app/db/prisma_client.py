@@ -16,6 +16,69 @@ from prisma.enums import ThreadStatus, ReplyIntent
 from app.config import settings
 
 
+# Prisma camelCase field -> snake_case key returned to callers
+_SNAKE_CASE_KEYS = {
+    'messageId': 'message_id',
+    'threadId': 'thread_id',
+    'gmMsgid': 'gm_msgid',
+    'accountEmail': 'account_email',
+    'creatorEmail': 'creator_email',
+    'initialReplyReceivedAt': 'initial_reply_received_at',
+    'initialReplyProcessedAt': 'initial_reply_processed_at',
+    'initialReplyIntent': 'initial_reply_intent',
+    'initialReplyHasContact': 'initial_reply_has_contact',
+    'currentStage': 'current_stage',
+    'lastFollowupSentAt': 'last_followup_sent_at',
+    'nextFollowupAt': 'next_followup_at',
+    'failedSends': 'failed_sends',
+    'followupsSent': 'followups_sent',
+    'stopReason': 'stop_reason',
+    'delegatedToHuman': 'delegated_to_human',
+    'delegatedAt': 'delegated_at',
+    'completedAt': 'completed_at',
+    'createdAt': 'created_at',
+    'updatedAt': 'updated_at',
+    'emailThreadId': 'email_thread_id',
+    'receivedAt': 'received_at',
+    'processedAt': 'processed_at',
+    'replyToStage': 'reply_to_stage',
+    'bodyText': 'body_text',
+    'bodyHtml': 'body_html',
+    'hasPhone': 'has_phone',
+    'hasAddress': 'has_address',
+    'extractedPhone': 'extracted_phone',
+    'extractedAddress': 'extracted_address',
+    'analysisDetails': 'analysis_details',
+    'sentAt': 'sent_at',
+    'templateUsed': 'template_used',
+    'sendSuccess': 'send_success',
+    'sendError': 'send_error',
+    'smtpMessageId': 'smtp_message_id',
+    'fromStage': 'from_stage',
+    'toStage': 'to_stage',
+    'fromStatus': 'from_status',
+    'toStatus': 'to_status',
+    'triggeredByReplyId': 'triggered_by_reply_id',
+    'transitionedAt': 'transitioned_at'
+}
+
+# update_thread() keyword -> Prisma EmailThread field
+_THREAD_FIELDS = {
+    'intent': 'initialReplyIntent',
+    'has_contact': 'initialReplyHasContact',
+    'current_stage': 'currentStage',
+    'last_followup_sent_at': 'lastFollowupSentAt',
+    'next_followup_at': 'nextFollowupAt',
+    'failed_sends': 'failedSends',
+    'followups_sent': 'followupsSent',
+    'status': 'status',
+    'stop_reason': 'stopReason',
+    'delegated_to_human': 'delegatedToHuman',
+    'delegated_at': 'delegatedAt',
+    'completed_at': 'completedAt'
+}
+
+
 class DatabaseNotConnectedError(RuntimeError):
     """Raised when database operations are attempted without an active connection."""
     pass
@@ -66,57 +129,13 @@ class PrismaDatabase:
         Returns:
             Dict with snake_case keys
         """
-        mapping = {
-            'messageId': 'message_id',
-            'threadId': 'thread_id',
-            'accountEmail': 'account_email',
-            'creatorEmail': 'creator_email',
-            'initialReplyReceivedAt': 'initial_reply_received_at',
-            'initialReplyProcessedAt': 'initial_reply_processed_at',
-            'initialReplyIntent': 'initial_reply_intent',
-            'initialReplyHasContact': 'initial_reply_has_contact',
-            'currentStage': 'current_stage',
-            'lastFollowupSentAt': 'last_followup_sent_at',
-            'nextFollowupAt': 'next_followup_at',
-            'failedSends': 'failed_sends',
-            'followupsSent': 'followups_sent',
-            'stopReason': 'stop_reason',
-            'delegatedToHuman': 'delegated_to_human',
-            'delegatedAt': 'delegated_at',
-            'completedAt': 'completed_at',
-            'createdAt': 'created_at',
-            'updatedAt': 'updated_at',
-            'emailThreadId': 'email_thread_id',
-            'receivedAt': 'received_at',
-            'processedAt': 'processed_at',
-            'replyToStage': 'reply_to_stage',
-            'bodyText': 'body_text',
-            'bodyHtml': 'body_html',
-            'hasPhone': 'has_phone',
-            'hasAddress': 'has_address',
-            'extractedPhone': 'extracted_phone',
-            'extractedAddress': 'extracted_address',
-            'analysisDetails': 'analysis_details',
-            'sentAt': 'sent_at',
-            'templateUsed': 'template_used',
-            'sendSuccess': 'send_success',
-            'sendError': 'send_error',
-            'smtpMessageId': 'smtp_message_id',
-            'fromStage': 'from_stage',
-            'toStage': 'to_stage',
-            'fromStatus': 'from_status',
-            'toStatus': 'to_status',
-            'triggeredByReplyId': 'triggered_by_reply_id',
-            'transitionedAt': 'transitioned_at'
-        }
-        
         result = {}
         for key, value in data.items():
             # Convert enum to string
             if hasattr(value, 'value'):
                 value = value.value
             # Use mapped key or original key
-            snake_key = mapping.get(key, key)
+            snake_key = _SNAKE_CASE_KEYS.get(key, key)
             result[snake_key] = value
         
         return result
@@ -131,7 +150,8 @@ class PrismaDatabase:
         received_at: datetime,
         intent: Optional[str] = None,
         has_contact: bool = False,
-        status: str = 'PROCESSING'
+        status: str = 'PROCESSING',
+        gm_msgid: Optional[str] = None
     ) -> Optional[int]:
         """
         Insert new email thread with idempotency.
@@ -148,6 +168,7 @@ class PrismaDatabase:
             intent: Classified intent (optional)
             has_contact: Whether contact details were found
             status: Thread status (default: PROCESSING)
+            gm_msgid: Gmail X-GM-MSGID of the message (Gmail accounts only)
             
         Returns:
             Thread ID (int) if successfully inserted.
@@ -174,6 +195,7 @@ class PrismaDatabase:
                 data={
                     'messageId': message_id,
                     'threadId': thread_id,
+                    'gmMsgid': gm_msgid,
                     'accountEmail': account_email,
                     'creatorEmail': creator_email,
                     'subject': subject,
@@ -253,23 +275,8 @@ class PrismaDatabase:
         
         # Convert snake_case to camelCase for Prisma
         data = {}
-        field_mapping = {
-            'intent': 'initialReplyIntent',
-            'has_contact': 'initialReplyHasContact',
-            'current_stage': 'currentStage',
-            'last_followup_sent_at': 'lastFollowupSentAt',
-            'next_followup_at': 'nextFollowupAt',
-            'failed_sends': 'failedSends',
-            'followups_sent': 'followupsSent',
-            'status': 'status',
-            'stop_reason': 'stopReason',
-            'delegated_to_human': 'delegatedToHuman',
-            'delegated_at': 'delegatedAt',
-            'completed_at': 'completedAt'
-        }
-        
         for key, value in kwargs.items():
-            prisma_key = field_mapping.get(key, key)
+            prisma_key = _THREAD_FIELDS.get(key, key)
             
             # Convert string values to enums where needed
             if prisma_key == 'status' and isinstance(value, str):
@@ -315,6 +322,47 @@ class PrismaDatabase:
         except Exception:
             return None
     
+    async def record_send_failure(
+        self,
+        message_id: str,
+        max_failed: int
+    ) -> Optional[Dict]:
+        """
+        Increment failed_sends and stop the thread once max_failed is reached.
+        
+        Runs as a single UPDATE ... RETURNING so the counter and the stop
+        reason are written atomically in one round trip.
+        
+        Args:
+            message_id: Unique Gmail message ID
+            max_failed: Failure count at which automation stops
+            
+        Returns:
+            Dict with failed_sends and stop_reason, or None if message_id not found
+        """
+        self._ensure_connected()
+        
+        try:
+            rows = await self.client.query_raw(
+                """
+                UPDATE email_threads
+                SET failed_sends = failed_sends + 1,
+                    stop_reason = CASE
+                        WHEN failed_sends + 1 >= $2 THEN 'MAX_SEND_FAILURES'
+                        ELSE stop_reason
+                    END,
+                    updated_at = NOW()
+                WHERE message_id = $1
+                RETURNING failed_sends, stop_reason
+                """,
+                message_id,
+                max_failed
+            )
+        except Exception:
+            return None
+        
+        return rows[0] if rows else None
+    
     async def increment_followups_sent(self, message_id: str) -> Optional[int]:
         """
         Increment followups_sent counter for a thread.
@@ -6,10 +6,14 @@ via IMAP, with graceful error handling for connection issues.
 """
 
 import asyncio
-from typing import Dict, Optional
+import time
+from itertools import batched
+from typing import Dict, List, Optional
 import aioimaplib
 
 from app.config import settings
+from app.imap.parser import FETCH_BATCH_SIZE
+from app.imap.tls import imap_ssl_context
 from app.utils.logger import get_logger
 
 
@@ -29,25 +33,31 @@ class IMAPController:
         """Initialize IMAP controller."""
         self.connections: Dict[str, Optional[aioimaplib.IMAP4_SSL]] = {}
         self.accounts = self._load_accounts()
+        # Server settings are shared by every account
+        self._imap_host = settings.imap_server
+        self._imap_port = settings.imap_port
+        self._is_gmail = 'gmail' in self._imap_host.lower()
+        # Folder currently selected on each connection, so SELECT is only
+        # sent when it changes
+        self._selected: Dict[str, str] = {}
+        # Liveness is probed with NOOP only this often; in between, a dead
+        # connection surfaces on the next real command and is dropped
+        self._noop_interval = settings.polling_interval * 5
+        self._last_noop: Dict[str, float] = {}
     
-    def _load_accounts(self) -> Dict[str, Dict[str, str]]:
+    def _load_accounts(self) -> Dict[str, str]:
         """
-        Load Gmail account configurations from settings.
+        Load Gmail account credentials from settings.
         
         Returns:
-            Dict mapping email addresses to account configs
+            Dict mapping email addresses to app passwords
         """
         accounts = {}
         
         for email in settings.all_account_emails:
             password = settings.get_account_password(email)
             if email and password:
-                accounts[email] = {
-                    'email': email,
-                    'password': password,
-                    'imap_server': settings.imap_server,
-                    'imap_port': settings.imap_port
-                }
+                accounts[email] = password
         
         return accounts
     
@@ -65,17 +75,16 @@ class IMAPController:
             logger.error(f"Account {account_email} not configured")
             return None
         
-        account = self.accounts[account_email]
-        
         try:
             client = aioimaplib.IMAP4_SSL(
-                host=account['imap_server'],
-                port=account['imap_port']
+                host=self._imap_host,
+                port=self._imap_port,
+                ssl_context=imap_ssl_context()
             )
             
             await client.wait_hello_from_server()
             
-            response = await client.login(account['email'], account['password'])
+            response = await client.login(account_email, self.accounts[account_email])
             
             if response.result != 'OK':
                 logger.error(f"Authentication failed for {account_email}")
@@ -100,51 +109,120 @@ class IMAPController:
         Returns:
             Connected IMAP client, or None if connection fails
         """
-        if account_email in self.connections and self.connections[account_email]:
+        client = self.connections.get(account_email)
+        
+        if client:
+            transport = client.protocol.transport
+            if transport is None or transport.is_closing():
+                self._drop_connection(account_email)
+                client = None
+        
+        if client:
+            now = time.monotonic()
+            if now - self._last_noop.get(account_email, 0.0) <= self._noop_interval:
+                return client
+            
             try:
-                await self.connections[account_email].noop()
-                return self.connections[account_email]
+                await client.noop()
+                self._last_noop[account_email] = now
+                return client
             except Exception:
                 logger.debug(f"Existing connection dead for {account_email}, reconnecting")
-                self.connections[account_email] = None
+                self._drop_connection(account_email)
         
         client = await self._connect(account_email)
         if client:
             self.connections[account_email] = client
+            self._last_noop[account_email] = time.monotonic()
         
         return client
     
+    def _drop_connection(self, account_email: str):
+        """Forget a connection (and its folder and probe time) so the next call reconnects."""
+        self.connections[account_email] = None
+        self._selected.pop(account_email, None)
+        self._last_noop.pop(account_email, None)
+    
+    async def _select(
+        self,
+        client: aioimaplib.IMAP4_SSL,
+        account_email: str,
+        folder: str = 'INBOX'
+    ) -> bool:
+        """
+        Select folder unless it is already selected on this connection.
+        
+        Args:
+            client: Connected IMAP client
+            account_email: Email address of account
+            folder: Mailbox to select (default: INBOX)
+            
+        Returns:
+            True if folder is selected, False otherwise
+        """
+        if self._selected.get(account_email) == folder:
+            return True
+        
+        response = await client.select(folder)
+        if response.result != 'OK':
+            logger.error(f"Failed to select {folder} for {account_email}: {response}")
+            return False
+        
+        self._selected[account_email] = folder
+        return True
+    
     async def _find_message_by_id(
         self,
         client: aioimaplib.IMAP4_SSL,
-        message_id: str
+        message_id: str,
+        gm_msgid: Optional[str] = None
     ) -> Optional[str]:
         """
         Find message UID by Message-ID header.
         
+        Uses UID SEARCH so the result stays valid if other messages are
+        expunged before the follow-up STORE. Uses Gmail's indexed X-GM-MSGID
+        search when a Gmail message ID is known, since HEADER searches force
+        a full header scan on the server.
+        
         Args:
             client: Connected IMAP client
             message_id: Gmail Message-ID header value
+            gm_msgid: Gmail X-GM-MSGID of the message (Gmail accounts only)
             
         Returns:
             Message UID as string, or None if not found
+            
+        Raises:
+            aioimaplib.Abort, aioimaplib.CommandTimeout, OSError: If the
+                connection failed, so the caller drops it
         """
         try:
-            search_query = f'HEADER Message-ID "{message_id}"'
-            response = await client.search(search_query)
+            if gm_msgid:
+                search_query = f'X-GM-MSGID {gm_msgid}'
+            else:
+                search_query = f'HEADER Message-ID "{message_id}"'
+            response = await client.uid_search(search_query)
             
             if response.result != 'OK':
                 logger.warning(f"Search failed for message_id {message_id}")
                 return None
             
-            message_ids = response.lines[0].decode().strip().split()
+            # Only the first UID is needed; avoid decoding/splitting the whole line
+            line = response.lines[0].strip()
+            space = line.find(b' ')
+            first = line[:space] if space != -1 else line
             
-            if not message_ids or message_ids == [b'']:
+            if not first:
                 logger.warning(f"Message not found: {message_id}")
                 return None
             
-            uid = message_ids[0]
-            return uid.decode() if isinstance(uid, bytes) else uid
+            return first.decode()
+        
+        except (aioimaplib.Abort, aioimaplib.CommandTimeout, OSError):
+            # Liveness is not probed before every use, so this may be the
+            # first sign of a dead connection
+            raise
             
         except Exception as e:
             logger.error(f"Error searching for message {message_id}: {e}")
@@ -153,7 +231,8 @@ class IMAPController:
     async def mark_as_read(
         self,
         account_email: str,
-        message_id: str
+        message_id: str,
+        gm_msgid: Optional[str] = None
     ) -> bool:
         """
         Mark email as read by setting Seen flag.
@@ -161,6 +240,7 @@ class IMAPController:
         Args:
             account_email: Email address of account that received the message
             message_id: Gmail Message-ID header value
+            gm_msgid: Gmail X-GM-MSGID of the message, if known
             
         Returns:
             True if successfully marked as read, False otherwise
@@ -171,16 +251,18 @@ class IMAPController:
                 logger.error(f"Could not connect to {account_email}")
                 return False
             
-            await client.select('INBOX')
+            if not await self._select(client, account_email):
+                return False
             
-            uid = await self._find_message_by_id(client, message_id)
+            gm_msgid = gm_msgid if self._is_gmail else None
+            uid = await self._find_message_by_id(client, message_id, gm_msgid)
             if not uid:
                 logger.warning(
                     f"Could not find message {message_id} in {account_email}"
                 )
                 return False
             
-            response = await client.store(uid, '+FLAGS', r'(\Seen)')
+            response = await client.uid('store', uid, '+FLAGS', r'(\Seen)')
             
             if response.result != 'OK':
                 logger.error(
@@ -196,12 +278,14 @@ class IMAPController:
                 f"Error marking message {message_id} as read in {account_email}: {e}",
                 exc_info=True
             )
+            self._drop_connection(account_email)
             return False
     
     async def mark_as_unread(
         self,
         account_email: str,
-        message_id: str
+        message_id: str,
+        gm_msgid: Optional[str] = None
     ) -> bool:
         """
         Mark email as unread by removing Seen flag.
@@ -209,6 +293,7 @@ class IMAPController:
         Args:
             account_email: Email address of account that received the message
             message_id: Gmail Message-ID header value
+            gm_msgid: Gmail X-GM-MSGID of the message, if known
             
         Returns:
             True if successfully marked as unread, False otherwise
@@ -219,16 +304,18 @@ class IMAPController:
                 logger.error(f"Could not connect to {account_email}")
                 return False
             
-            await client.select('INBOX')
+            if not await self._select(client, account_email):
+                return False
             
-            uid = await self._find_message_by_id(client, message_id)
+            gm_msgid = gm_msgid if self._is_gmail else None
+            uid = await self._find_message_by_id(client, message_id, gm_msgid)
             if not uid:
                 logger.warning(
                     f"Could not find message {message_id} in {account_email}"
                 )
                 return False
             
-            response = await client.store(uid, '-FLAGS', r'(\Seen)')
+            response = await client.uid('store', uid, '-FLAGS', r'(\Seen)')
             
             if response.result != 'OK':
                 logger.error(
@@ -244,20 +331,120 @@ class IMAPController:
                 f"Error marking message {message_id} as unread in {account_email}: {e}",
                 exc_info=True
             )
+            self._drop_connection(account_email)
+            return False
+    
+    async def _store_seen_bulk(
+        self,
+        account_email: str,
+        uids: List[str],
+        flag_op: str
+    ) -> bool:
+        """
+        Add or remove the Seen flag on many messages with one STORE per chunk.
+        
+        Uses the .SILENT form so the server does not echo an untagged FETCH
+        response for every UID.
+        
+        Args:
+            account_email: Email address of account
+            uids: Message UIDs (as attached by the watcher)
+            flag_op: '+FLAGS.SILENT' or '-FLAGS.SILENT'
+            
+        Returns:
+            True if every chunk was stored, False otherwise
+        """
+        try:
+            client = await self._ensure_connection(account_email)
+            if not client:
+                logger.error(f"Could not connect to {account_email}")
+                return False
+            
+            if not await self._select(client, account_email):
+                return False
+            
+            ok = True
+            for chunk in batched(uids, FETCH_BATCH_SIZE):
+                response = await client.uid(
+                    'store', ','.join(chunk), flag_op, r'(\Seen)'
+                )
+                
+                if response.result != 'OK':
+                    logger.error(
+                        f"Failed to store {flag_op} on {len(chunk)} messages "
+                        f"in {account_email}: {response}"
+                    )
+                    ok = False
+            
+            return ok
+            
+        except Exception as e:
+            logger.error(
+                f"Error storing {flag_op} on {len(uids)} messages in {account_email}: {e}",
+                exc_info=True
+            )
+            self._drop_connection(account_email)
             return False
     
+    async def mark_as_read_bulk(self, account_email: str, uids: List[str]) -> bool:
+        """
+        Mark many emails as read in one round trip per 100 UIDs.
+        
+        Args:
+            account_email: Email address of account
+            uids: Message UIDs to mark as read
+            
+        Returns:
+            True if all messages were marked, False otherwise
+        """
+        if not uids:
+            return True
+        
+        success = await self._store_seen_bulk(account_email, uids, '+FLAGS.SILENT')
+        if success:
+            logger.info(f"Marked {len(uids)} messages as read in {account_email}")
+        return success
+    
+    async def mark_as_unread_bulk(self, account_email: str, uids: List[str]) -> bool:
+        """
+        Mark many emails as unread in one round trip per 100 UIDs.
+        
+        Args:
+            account_email: Email address of account
+            uids: Message UIDs to mark as unread
+            
+        Returns:
+            True if all messages were marked, False otherwise
+        """
+        if not uids:
+            return True
+        
+        success = await self._store_seen_bulk(account_email, uids, '-FLAGS.SILENT')
+        if success:
+            logger.info(f"Marked {len(uids)} messages as unread in {account_email}")
+        return success
+    
+    async def _safe_logout(self, email: str, client: aioimaplib.IMAP4_SSL):
+        """Log out a single connection, logging instead of raising on failure."""
+        try:
+            await client.logout()
+            logger.debug(f"Closed connection for {email}")
+        except Exception as e:
+            logger.warning(f"Error closing connection for {email}: {e}")
+    
     async def close_all(self):
-        """Close all IMAP connections."""
-        # Create a copy of items to avoid "dictionary changed size during iteration" error
+        """Close all IMAP connections concurrently."""
+        # Snapshot items to avoid "dictionary changed size during iteration" error
         connections_copy = list(self.connections.items())
         
-        for email, client in connections_copy:
-            if client:
-                try:
-                    await client.logout()
-                    logger.debug(f"Closed connection for {email}")
-                except Exception as e:
-                    logger.warning(f"Error closing connection for {email}: {e}")
+        await asyncio.gather(
+            *(
+                self._safe_logout(email, client)
+                for email, client in connections_copy
+                if client
+            ),
+            return_exceptions=True
+        )
         
         self.connections.clear()
 
@@ -266,29 +453,39 @@ class IMAPController:
 controller = IMAPController()
 
 
-async def mark_as_read(account_email: str, message_id: str) -> bool:
+async def mark_as_read(
+    account_email: str,
+    message_id: str,
+    gm_msgid: Optional[str] = None
+) -> bool:
     """
     Convenience function to mark email as read.
     
     Args:
         account_email: Email address of account
         message_id: Gmail Message-ID header value
+        gm_msgid: Gmail X-GM-MSGID of the message, if known
         
     Returns:
         True if successful, False otherwise
     """
-    return await controller.mark_as_read(account_email, message_id)
+    return await controller.mark_as_read(account_email, message_id, gm_msgid)
 
 
-async def mark_as_unread(account_email: str, message_id: str) -> bool:
+async def mark_as_unread(
+    account_email: str,
+    message_id: str,
+    gm_msgid: Optional[str] = None
+) -> bool:
     """
     Convenience function to mark email as unread.
     
     Args:
         account_email: Email address of account
         message_id: Gmail Message-ID header value
+        gm_msgid: Gmail X-GM-MSGID of the message, if known
         
     Returns:
         True if successful, False otherwise
     """
-    return await controller.mark_as_unread(account_email, message_id)
+    return await controller.mark_as_unread(account_email, message_id, gm_msgid)
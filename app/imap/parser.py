@@ -10,7 +10,8 @@ import email
 import re
 from email.message import Message
 from email.header import decode_header
-from typing import Dict, Optional
+from email.parser import BytesHeaderParser
+from typing import Dict, List, Optional, Tuple
 from html.parser import HTMLParser
 from io import StringIO
 
@@ -20,6 +21,34 @@ except ImportError:
     EmailReplyParser = None
 
 
+# Max messages per FETCH command; larger sets risk "maximum request size exceeded"
+FETCH_BATCH_SIZE = 100
+
+# Untagged FETCH line opening a message: "<seq> FETCH (..."
+_FETCH_LINE_RE = re.compile(rb'^(\d+) FETCH \(')
+_FETCH_UID_RE = re.compile(rb'\bUID (\d+)')
+# Literal announcement "{<size>}" closing a FETCH line; the next line is the data
+_LITERAL_SIZE_RE = re.compile(rb'\{(\d+)\}$')
+
+# Angle-bracketed address in From/To headers: "Name" <email@example.com>
+_ANGLE_ADDR_RE = re.compile(r'<([^>]+)>')
+
+# Trailing spaces/tabs on each line, and runs of more than two blank lines
+_TRAILING_WS_RE = re.compile(r'[^\S\n]+$', re.MULTILINE)
+_EXCESS_BLANK_LINES_RE = re.compile(r'\n{4,}')
+
+# Fallback HTML tag stripper
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+# First signature marker or "On ... wrote:" line; everything after it is dropped
+_QUOTE_CUTOFF_RE = re.compile(
+    r'^[^\S\n]*(?:--|___|---|On .+ wrote:)[^\S\n]*$',
+    re.MULTILINE
+)
+# Quoted line ("> ...") together with its line break
+_QUOTED_LINE_RE = re.compile(r'^[^\S\n]*>[^\n]*\n?', re.MULTILINE)
+
+
 class HTMLStripper(HTMLParser):
     """
     Simple HTML tag stripper.
@@ -52,7 +81,7 @@ class EmailParser:
     
     def __init__(self):
         """Initialize email parser."""
-        pass
+        self._header_parser = BytesHeaderParser()
     
     def parse_email(self, raw_email: bytes) -> Dict[str, any]:
         """
@@ -100,6 +129,34 @@ class EmailParser:
             'body': body
         }
     
+    def parse_headers(self, raw_email: bytes) -> Dict[str, any]:
+        """
+        Parse only the headers of a raw IMAP email.
+        
+        Stops at the blank line after the headers, so MIME parts and
+        attachments are never decoded. Use for first-pass filtering where
+        the body is not needed.
+        
+        Args:
+            raw_email: Raw email bytes (full message or header block)
+            
+        Returns:
+            Same dict as parse_email, without the body key
+        """
+        msg = self._header_parser.parsebytes(raw_email)
+        
+        from_email, from_name = self._parse_from_header(msg.get('From', ''))
+        
+        return {
+            'message_id': self._extract_message_id(msg),
+            'thread_id': self._extract_thread_id(msg),
+            'subject': self._decode_header(msg.get('Subject', '')),
+            'from_email': from_email,
+            'from_name': from_name,
+            'to_email': self._extract_email_address(msg.get('To', '')),
+            'date': msg.get('Date', '')
+        }
+    
     def clean_email_body(self, body: str) -> str:
         """
         Clean email body by removing HTML, quoted text, and signatures.
@@ -189,7 +246,7 @@ class EmailParser:
         from_header = self._decode_header(from_header)
         
         # Pattern: "Name" <email@example.com> or email@example.com
-        match = re.search(r'<([^>]+)>', from_header)
+        match = _ANGLE_ADDR_RE.search(from_header)
         if match:
             email_addr = match.group(1)
             name = from_header[:match.start()].strip().strip('"')
@@ -201,7 +258,7 @@ class EmailParser:
     def _extract_email_address(self, header: str) -> str:
         """Extract email address from header."""
         header = self._decode_header(header)
-        match = re.search(r'<([^>]+)>', header)
+        match = _ANGLE_ADDR_RE.search(header)
         if match:
             return match.group(1)
         return header.strip()
@@ -268,34 +325,22 @@ class EmailParser:
             return stripper.get_text()
         except Exception:
             # Fallback to regex-based stripping
-            text = re.sub(r'<[^>]+>', '', text)
-            return text
+            return _HTML_TAG_RE.sub('', text)
     
     def _basic_quote_removal(self, text: str) -> str:
         """
         Basic quoted text removal fallback.
         
         Removes common quote patterns when email_reply_parser unavailable.
+        Finds the signature/reply cutoff with a single scan of the body,
+        then drops lines starting with > (quoted text) in place, without
+        splitting the body into a list of lines.
         """
-        lines = text.split('\n')
-        cleaned_lines = []
-        
-        for line in lines:
-            # Skip lines starting with > (quoted text)
-            if line.strip().startswith('>'):
-                continue
-            
-            # Stop at common signature markers
-            if line.strip() in ['--', '___', '---']:
-                break
-            
-            # Stop at "On ... wrote:" patterns
-            if re.match(r'^On .+ wrote:$', line.strip()):
-                break
-            
-            cleaned_lines.append(line)
+        cutoff = _QUOTE_CUTOFF_RE.search(text)
+        if cutoff:
+            text = text[:cutoff.start()]
         
-        return '\n'.join(cleaned_lines)
+        return _QUOTED_LINE_RE.sub('', text)
     
     def _normalize_whitespace(self, text: str) -> str:
         """
@@ -303,23 +348,84 @@ class EmailParser:
         
         Removes excessive blank lines and trailing spaces.
         """
-        # Remove trailing whitespace from each line
-        lines = [line.rstrip() for line in text.split('\n')]
-        
-        # Remove excessive blank lines (max 2 consecutive)
-        normalized = []
-        blank_count = 0
-        
-        for line in lines:
-            if not line.strip():
-                blank_count += 1
-                if blank_count <= 2:
-                    normalized.append(line)
-            else:
-                blank_count = 0
-                normalized.append(line)
+        # Remove trailing whitespace from each line, then cap blank runs at
+        # two lines; one C-level scan each instead of a per-line Python loop
+        text = _TRAILING_WS_RE.sub('', text)
+        return _EXCESS_BLANK_LINES_RE.sub('\n\n\n', text)
+
+
+def split_fetch_response(lines: List) -> List[Tuple[str, bytes, bytes]]:
+    """
+    Split a multi-message FETCH response into per-message parts.
+    
+    aioimaplib returns each message as an untagged "<seq> FETCH (..." line
+    followed by its literal payloads and continuation lines. Literals are
+    located by the "{<size>}" announcement ending the preceding line and
+    sliced to exactly that many bytes, so no content heuristics are needed.
+    A BODY[HEADER] literal is always placed first, so a separately fetched
+    header and text reassemble into one RFC822 message whatever order the
+    server returns them in. A message with a single literal gets that
+    buffer back as-is, without being copied.
+    
+    Args:
+        lines: Response lines from a FETCH or UID FETCH command
+        
+    Returns:
+        List of (key, metadata, body) tuples in response order, where key is
+        the message UID if present (sequence number otherwise), metadata is
+        the joined non-literal lines and body is the joined literal data
+        (bytes or bytearray)
+    """
+    messages = []
+    meta = None
+    parts = None
+    literal_size = None
+    literal_is_header = False
+    
+    def flush():
+        if meta is None:
+            return
+        meta_bytes = b' '.join(meta)
+        uid = _FETCH_UID_RE.search(meta_bytes)
+        key = uid.group(1) if uid else _FETCH_LINE_RE.match(meta[0]).group(1)
+        if len(parts) == 1:
+            body = parts[0]
+        else:
+            body = b''.join(parts)
+        messages.append((key.decode(), meta_bytes, body))
+    
+    for line in lines:
+        if literal_size is not None:
+            if parts is not None:
+                literal = line if len(line) == literal_size else line[:literal_size]
+                if literal_is_header:
+                    parts.insert(0, literal)
+                else:
+                    parts.append(literal)
+            literal_size = None
+            continue
+        
+        # Only lines starting with a digit can open a new message
+        if line[:1].isdigit() and _FETCH_LINE_RE.match(line):
+            flush()
+            meta = [line]
+            parts = []
+        elif meta is not None:
+            meta.append(line)
+        else:
+            continue
         
-        return '\n'.join(normalized)
+        size = _LITERAL_SIZE_RE.search(line)
+        if size:
+            literal_size = int(size.group(1))
+            literal_is_header = b'[HEADER]' in line
+    
+    flush()
+    return messages
+
+
+# Global parser instance (stateless, safe to share)
+_parser = EmailParser()
 
 
 def parse_email(raw_email: bytes) -> Dict[str, any]:
@@ -332,5 +438,40 @@ def parse_email(raw_email: bytes) -> Dict[str, any]:
     Returns:
         Parsed email dict
     """
-    parser = EmailParser()
-    return parser.parse_email(raw_email)
+    return _parser.parse_email(raw_email)
+
+
+def parse_headers_only(raw_email: bytes) -> Dict[str, any]:
+    """
+    Convenience function to parse only email headers.
+    
+    Args:
+        raw_email: Raw email bytes from IMAP
+        
+    Returns:
+        Parsed header dict (no body)
+    """
+    return _parser.parse_headers(raw_email)
+
+
+def parse_many(raw_emails: List[bytes]) -> List:
+    """
+    Parse a batch of emails with the shared parser.
+    
+    Meant to run in a worker thread, so a whole FETCH batch costs one
+    thread hand-off instead of one per message.
+    
+    Args:
+        raw_emails: Raw email bytes from IMAP
+        
+    Returns:
+        Parsed email dict for each input, or the exception raised while
+        parsing it, in input order
+    """
+    results = []
+    for raw_email in raw_emails:
+        try:
+            results.append(_parser.parse_email(raw_email))
+        except Exception as e:
+            results.append(e)
+    return results
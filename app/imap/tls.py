@@ -0,0 +1,24 @@
+"""
+Shared TLS configuration for IMAP connections.
+
+Building an SSLContext loads and parses the system CA bundle, which is
+far more expensive than the context itself. aioimaplib creates a fresh
+default context for every IMAP4_SSL instance, so reconnect storms paid
+that cost on every retry; the watcher and controller share one instead.
+"""
+
+import ssl
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def imap_ssl_context() -> ssl.SSLContext:
+    """
+    Return the process-wide SSLContext for IMAP connections.
+    
+    Uses the same verification settings aioimaplib applies by default.
+    
+    Returns:
+        Shared client-side SSLContext
+    """
+    return ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
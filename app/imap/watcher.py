@@ -1,22 +1,126 @@
 """
 IMAP watcher for monitoring 3 Gmail accounts.
 
-Polls Gmail IMAP servers for new unseen emails, filters replies to outreach,
-and handles connection failures with exponential backoff.
+Watches Gmail IMAP servers (IDLE with polling fallback) for new unseen
+emails, filters replies to outreach, and handles connection failures
+with exponential backoff.
 """
 
 import asyncio
-from typing import List, Dict, Optional
+import logging
+import random
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import batched
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 import aioimaplib
 
 from app.config import settings
-from app.imap.parser import parse_email
+from app.imap.parser import (
+    FETCH_BATCH_SIZE,
+    parse_headers_only,
+    parse_many,
+    split_fetch_response
+)
+from app.imap.tls import imap_ssl_context
 from app.utils.logger import get_logger
 
 
 logger = get_logger(__name__)
 
+# Gmail's message ID, returned when X-GM-MSGID is requested in FETCH
+_GM_MSGID_RE = re.compile(rb'X-GM-MSGID (\d+)')
+
+# Subject prefixes marking a reply or forward (incl. German/Nordic/French/Dutch)
+_REPLY_SUBJECT_PREFIXES = ('Re:', 'Fwd:', 'Fw:', 'Aw:', 'Sv:', 'Tr:', 'Antw:')
+_REPLY_PREFIX_RE = re.compile(
+    '^(?:' + '|'.join(re.escape(prefix[:-1]) for prefix in _REPLY_SUBJECT_PREFIXES) + '):',
+    re.IGNORECASE
+)
+
+# SEARCH keys matching the same messages is_reply_to_outreach accepts: a
+# reply header or a reply/forward subject prefix. HEADER <name> "" matches
+# any message carrying that header; SUBJECT is a case-insensitive substring
+# match, so this is a superset. "OR" is binary, hence one per extra key.
+_REPLY_KEYS = (
+    'HEADER In-Reply-To ""',
+    'HEADER References ""',
+    *(f'SUBJECT "{prefix}"' for prefix in _REPLY_SUBJECT_PREFIXES)
+)
+_REPLY_SEARCH_KEYS = 'OR ' * (len(_REPLY_KEYS) - 1) + ' '.join(_REPLY_KEYS)
+_SEARCH_CRITERIA_TEMPLATE = 'UNSEEN SINCE {date} ' + _REPLY_SEARCH_KEYS
+
+# UIDVALIDITY from the SELECT response; a change invalidates remembered UIDs
+_UIDVALIDITY_RE = re.compile(rb'UIDVALIDITY (\d+)')
+
+# Only look back this far for unseen replies
+SEARCH_LOOKBACK_DAYS = 7
+
+
+@lru_cache(maxsize=1)
+def _since_date(hour_bucket: int) -> str:
+    """Format the SINCE date for an hour bucket (only recomputed hourly)."""
+    return (datetime.now() - timedelta(days=SEARCH_LOOKBACK_DAYS)).strftime('%d-%b-%Y')
+
+
+def since_date_str() -> str:
+    """
+    Get the SEARCH SINCE date for the lookback window.
+    
+    Cached per hour, since the date only changes once a day.
+    
+    Returns:
+        Date SEARCH_LOOKBACK_DAYS ago in IMAP format (DD-Mon-YYYY)
+    """
+    return _since_date(int(time.time()) // 3600)
+
+# Re-arm IDLE before Gmail silently stops delivering pushes (~10 minutes)
+IDLE_TIMEOUT_SECONDS = 9 * 60
+
+# Probe idle connections with NOOP at most this often, smudged by +/- jitter
+NOOP_INTERVAL_SECONDS = 30.0
+NOOP_JITTER_SECONDS = 5.0
+
+# Only headers and the start of the text are fetched; enough for reply
+# detection and analysis without downloading attachments
+BODY_SNIPPET_BYTES = 4096
+_FETCH_PARTS = f'BODY.PEEK[HEADER] BODY.PEEK[TEXT]<0.{BODY_SNIPPET_BYTES}>'
+
+# Envelope fetched first to decide whether a message is worth fetching at all
+_ENVELOPE_FETCH = (
+    '(UID BODY.PEEK[HEADER.FIELDS '
+    '(FROM SUBJECT MESSAGE-ID IN-REPLY-TO REFERENCES)])'
+)
+
+# Keep non-IDLE connections from being dropped by the server
+KEEPALIVE_INTERVAL_SECONDS = 4 * 60
+
+# Share of the polling interval one account may spend per cycle
+ACCOUNT_TIMEOUT_FRACTION = 0.8
+
+# Share of that budget after which no new FETCH batch is started, so a large
+# backlog returns what it has instead of being cancelled by the hard timeout
+FETCH_DEADLINE_FRACTION = 0.75
+
+# Processing attempts per fetched email before it is left to a human
+MAX_PROCESS_ATTEMPTS = 3
+
+# Full-jitter backoff bounds for reconnect attempts (seconds)
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_CAP_SECONDS = 30.0
+
+
+@dataclass(frozen=True, slots=True)
+class Account:
+    """Immutable IMAP account configuration."""
+    email: str
+    password: str
+    imap_server: str
+    imap_port: int
+
 
 class IMAPConnectionError(Exception):
     """Raised when IMAP connection fails."""
@@ -37,28 +141,52 @@ class IMAPWatcher:
     failures with exponential backoff and stops retrying on auth errors.
     """
     
-    def __init__(self, polling_interval: int = 60):
+    UID_STATE_KEY = "imap:uid_state:{email}"
+    
+    def __init__(self, polling_interval: int = 60, redis_client=None):
         """
         Initialize IMAP watcher.
         
         Args:
             polling_interval: Seconds between polling cycles (default: 60)
+            redis_client: Optional connected redis.asyncio client used to
+                persist the per-account UID high-water mark across restarts
         """
         self.polling_interval = polling_interval
+        self.redis_client = redis_client
+        self._is_gmail = 'gmail' in settings.imap_server.lower()
         self.accounts = self._load_accounts()
         self.connections: Dict[str, Optional[aioimaplib.IMAP4_SSL]] = {}
+        self.last_noop: Dict[str, float] = {}
+        self._connect_locks: Dict[str, asyncio.Lock] = {}
+        # Highest UID already fetched per account, and the UIDVALIDITY it belongs to
+        self.highest_seen_uid: Dict[str, int] = {}
+        self.uid_validity: Dict[str, Optional[str]] = {}
+        self._uid_state_loaded: set = set()
+        # UIDs handed to the caller but not yet reported processed; the
+        # persisted mark stays below them so a restart fetches them again
+        self._unprocessed_uids: Dict[str, set] = {}
+        self._saved_uid: Dict[str, int] = {}
+        # UIDs whose processing failed, fetched again next cycle since the
+        # search only looks above the high-water mark, and their failures
+        self._retry_uids: Dict[str, set] = {}
+        self._process_attempts: Dict[str, Dict[int, int]] = {}
         self.running = False
+        self._keep_alive_task: Optional[asyncio.Task] = None
     
-    def _load_accounts(self) -> List[Dict[str, str]]:
+    def _load_accounts(self) -> Tuple[Account, ...]:
         """
         Load Gmail account configurations from settings.
         
         Returns:
-            List of account configs with email, password, imap_server, imap_port
+            Tuple of frozen Account configs
             
         Raises:
             ValueError: If required settings are missing
         """
+        # Server settings are shared, read them once
+        imap_server = settings.imap_server
+        imap_port = settings.imap_port
         accounts = []
         
         for email in settings.all_account_emails:
@@ -69,28 +197,26 @@ class IMAPWatcher:
                     f"Missing email or password for account: {email}"
                 )
             
-            accounts.append({
-                'email': email,
-                'password': password,
-                'imap_server': settings.imap_server,
-                'imap_port': settings.imap_port
-            })
+            accounts.append(Account(email, password, imap_server, imap_port))
         
-        return accounts
+        return tuple(accounts)
     
     async def connect_with_backoff(
         self,
-        account: Dict[str, str],
+        account: Account,
         max_retries: int = 5
     ) -> aioimaplib.IMAP4_SSL:
         """
         Connect to IMAP server with exponential backoff.
         
-        Retries connection failures with exponential backoff.
-        Stops retrying immediately on authentication errors to avoid lockouts.
+        Retries connection failures with full-jitter exponential backoff so
+        accounts failing together do not retry in lockstep. Total backoff
+        sleep is capped at half the polling interval to keep the watcher
+        from falling behind. Stops retrying immediately on authentication
+        errors to avoid lockouts.
         
         Args:
-            account: Account config dict
+            account: Account to use
             max_retries: Maximum connection attempts (default: 5)
             
         Returns:
@@ -100,33 +226,47 @@ class IMAPWatcher:
             IMAPAuthenticationError: If authentication fails (no retry)
             IMAPConnectionError: If connection fails after all retries
         """
+        retry_budget = self.polling_interval / 2
+        
         for attempt in range(max_retries):
             try:
                 logger.info(
-                    f"Connecting to IMAP for {account['email']} "
+                    f"Connecting to IMAP for {account.email} "
                     f"(attempt {attempt + 1}/{max_retries})"
                 )
                 
                 client = aioimaplib.IMAP4_SSL(
-                    host=account['imap_server'],
-                    port=account['imap_port']
+                    host=account.imap_server,
+                    port=account.imap_port,
+                    ssl_context=imap_ssl_context()
                 )
                 
                 await client.wait_hello_from_server()
                 
-                response = await client.login(account['email'], account['password'])
+                response = await client.login(account.email, account.password)
                 
                 if response.result != 'OK':
                     raise IMAPAuthenticationError(
-                        f"Authentication failed for {account['email']}: {response}"
+                        f"Authentication failed for {account.email}: {response}"
                     )
                 
-                logger.info(f"Successfully connected to IMAP for {account['email']}")
+                # Select once per connection; the mailbox stays selected across
+                # polls and IDLE, so no poll pays for a SELECT round trip
+                select_response = await client.select('INBOX')
+                
+                if select_response.result != 'OK':
+                    raise IMAPConnectionError(
+                        f"SELECT INBOX failed for {account.email}: {select_response}"
+                    )
+                
+                await self._track_uid_validity(account.email, select_response)
+                
+                logger.info(f"Successfully connected to IMAP for {account.email}")
                 return client
                 
             except IMAPAuthenticationError:
                 logger.error(
-                    f"Authentication failed for {account['email']} - stopping retries "
+                    f"Authentication failed for {account.email} - stopping retries "
                     "to avoid account lockout"
                 )
                 raise
@@ -134,173 +274,609 @@ class IMAPWatcher:
             except Exception as e:
                 if attempt == max_retries - 1:
                     logger.error(
-                        f"Failed to connect to IMAP for {account['email']} "
+                        f"Failed to connect to IMAP for {account.email} "
                         f"after {max_retries} attempts: {e}"
                     )
                     raise IMAPConnectionError(
                         f"Connection failed after {max_retries} attempts"
                     ) from e
                 
-                wait_time = 2 ** attempt
+                wait_time = random.uniform(
+                    0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt)
+                )
+                
+                if wait_time > retry_budget:
+                    logger.error(
+                        f"Retry budget exhausted for {account.email} "
+                        f"after {attempt + 1} attempts: {e}"
+                    )
+                    raise IMAPConnectionError(
+                        f"Connection failed after {attempt + 1} attempts "
+                        "(retry budget exhausted)"
+                    ) from e
+                
+                retry_budget -= wait_time
                 logger.warning(
-                    f"IMAP connection failed for {account['email']}: {e}. "
-                    f"Retrying in {wait_time}s..."
+                    f"IMAP connection failed for {account.email}: {e}. "
+                    f"Retrying in {wait_time:.1f}s..."
                 )
                 await asyncio.sleep(wait_time)
         
         raise IMAPConnectionError("Unexpected error in connection loop")
     
-    async def ensure_connection(self, account: Dict[str, str]) -> aioimaplib.IMAP4_SSL:
+    async def ensure_connection(self, account: Account) -> aioimaplib.IMAP4_SSL:
         """
         Ensure active IMAP connection for account.
         
         Reuses existing connection if available, otherwise creates new one.
+        A socket the server already closed is replaced immediately; beyond
+        that, liveness is only probed with NOOP once a smudged interval has passed
+        since the last probe; in between, a dead socket surfaces on the next
+        real command, which drops the connection for reconnect.
         
         Args:
-            account: Account config dict
+            account: Account to use
             
         Returns:
             Connected IMAP client
         """
-        email = account['email']
+        email = account.email
         
-        if email in self.connections and self.connections[email]:
-            try:
-                await self.connections[email].noop()
-                return self.connections[email]
-            except Exception as e:
-                logger.warning(f"Existing connection dead for {email}: {e}")
-                self.connections[email] = None
+        # Serialize per account so concurrent callers cannot open duplicate sockets
+        async with self._connect_locks.setdefault(email, asyncio.Lock()):
+            client = self.connections.get(email)
+            
+            if client:
+                transport = client.protocol.transport
+                if transport is None or transport.is_closing():
+                    logger.warning(f"Connection closed by server for {email}, reconnecting")
+                    client = self.connections[email] = None
+            
+            if client:
+                interval = NOOP_INTERVAL_SECONDS + random.uniform(
+                    -NOOP_JITTER_SECONDS, NOOP_JITTER_SECONDS
+                )
+                now = time.monotonic()
+                
+                if now - self.last_noop.get(email, 0.0) <= interval:
+                    return client
+                
+                try:
+                    await client.noop()
+                    self.last_noop[email] = now
+                    return client
+                except (aioimaplib.Abort, aioimaplib.CommandTimeout, OSError) as e:
+                    logger.warning(f"Existing connection dead for {email}: {e}")
+                    self._discard_connection(email)
+            
+            client = await self.connect_with_backoff(account)
+            self.connections[email] = client
+            self.last_noop[email] = time.monotonic()
+            return client
+    
+    def _discard_connection(self, email: str):
+        """
+        Forget an account's connection and close its socket.
+        
+        The session is presumed dead or stuck, so the transport is closed
+        directly rather than waiting on a LOGOUT the server may never answer.
+        
+        Args:
+            email: Account email
+        """
+        client = self.connections.get(email)
+        self.connections[email] = None
+        
+        if client is None:
+            return
+        
+        transport = client.protocol.transport
+        if transport is not None and not transport.is_closing():
+            transport.close()
+    
+    async def warm_pool(self):
+        """
+        Open all account connections concurrently and start the keepalive task.
+        
+        Moves the TLS + LOGIN handshakes off the first polling cycle, so cold
+        start costs the slowest handshake rather than their sum.
+        """
+        results = await asyncio.gather(
+            *(self.ensure_connection(account) for account in self.accounts),
+            return_exceptions=True
+        )
         
-        client = await self.connect_with_backoff(account)
-        self.connections[email] = client
-        return client
+        for account, result in zip(self.accounts, results):
+            if isinstance(result, Exception):
+                logger.warning(
+                    f"Could not pre-connect {account.email}, will retry on poll: {result}"
+                )
+        
+        if self._keep_alive_task is None or self._keep_alive_task.done():
+            self._keep_alive_task = asyncio.create_task(self._keep_alive())
     
-    async def fetch_new_replies(self, account: Dict[str, str]) -> List[Dict]:
+    async def _keep_alive(self):
+        """Periodically NOOP connections that are not currently in IDLE."""
+        while True:
+            await asyncio.sleep(KEEPALIVE_INTERVAL_SECONDS)
+            
+            for email, client in list(self.connections.items()):
+                # IDLE keeps the session alive itself, and NOOP is not allowed in it
+                if not client or client.has_pending_idle():
+                    continue
+                
+                try:
+                    await client.noop()
+                    self.last_noop[email] = time.monotonic()
+                except Exception as e:
+                    logger.warning(f"Keepalive failed for {email}, dropping connection: {e}")
+                    self._discard_connection(email)
+    
+    async def fetch_new_replies(
+        self,
+        account: Account,
+        date_str: Optional[str] = None,
+        deadline: Optional[float] = None
+    ) -> List[Dict]:
         """
         Fetch new unseen emails from account inbox (last 7 days only).
         
-        Selects INBOX, searches for unseen messages from the last 7 days,
-        and fetches their content.
+        Searches INBOX (selected at connect time) for unseen reply-like
+        messages from the last 7 days, and fetches their content in two
+        phases: a small header envelope to run is_reply_to_outreach on, then
+        the content of only the messages that pass. After the first cycle
+        the UID SEARCH is restricted to UIDs above the highest one already
+        fetched, so only the tail of the mailbox is examined; emails whose
+        processing failed are fetched again by UID first.
         
         Args:
-            account: Account config dict
+            account: Account to use
+            date_str: SEARCH SINCE date, shared across accounts in one cycle
+                (computed if not given)
+            deadline: Monotonic time after which no new batch is started;
+                the rest of the backlog is fetched next cycle
             
         Returns:
-            List of parsed email dicts
+            List of parsed reply email dicts
         """
+        email = account.email
+        retried = []
+        
         try:
+            # INBOX is selected when the connection is opened
             client = await self.ensure_connection(account)
             
-            await client.select('INBOX')
+            # Gmail exposes an indexed message ID, store it for O(1) lookups later
+            is_gmail = self._is_gmail
+            # BODY.PEEK so fetching does not set the Seen flag; the header and
+            # text snippet are rejoined into one message by split_fetch_response
+            fetch_items = (
+                f'(UID X-GM-MSGID {_FETCH_PARTS})' if is_gmail else f'(UID {_FETCH_PARTS})'
+            )
+            
+            if self._retry_uids.get(email):
+                retried = await self._refetch_failed(client, email, is_gmail, fetch_items)
             
-            # Calculate date 7 days ago in IMAP format (DD-Mon-YYYY)
-            seven_days_ago = datetime.now() - timedelta(days=7)
-            date_str = seven_days_ago.strftime('%d-%b-%Y')
+            if date_str is None:
+                date_str = since_date_str()
             
-            # Search for unseen emails from last 7 days
-            search_criteria = f'UNSEEN SINCE {date_str}'
-            response = await client.search(search_criteria)
+            # Search for unseen emails from last 7 days that look like replies,
+            # so non-replies are filtered server-side before any body transfer
+            search_criteria = _SEARCH_CRITERIA_TEMPLATE.format(date=date_str)
+            
+            last_uid = self.highest_seen_uid.get(email)
+            if last_uid is not None:
+                search_criteria = f'UID {last_uid + 1}:* {search_criteria}'
+            
+            response = await client.uid_search(search_criteria)
             
             if response.result != 'OK':
-                logger.warning(f"Search failed for {account['email']}: {response}")
-                return []
+                logger.warning(f"Search failed for {email}: {response}")
+                return retried
             
-            message_ids = response.lines[0].decode().strip().split()
+            # SEARCH results are ASCII digits; split as bytes, no decode needed
+            message_ids = response.lines[0].split()
             
-            if not message_ids or message_ids == [b'']:
-                return []
+            # "N:*" always matches the highest UID, even when it is below N
+            if last_uid is not None:
+                message_ids = [uid for uid in message_ids if int(uid) > last_uid]
             
-            logger.info(
-                f"Found {len(message_ids)} unseen emails in {account['email']}"
-            )
+            if not message_ids:
+                return retried
             
-            emails = []
+            # Ascending, so a failed batch never leaves a gap below the mark
+            message_ids.sort(key=int)
             
-            for idx, msg_id in enumerate(message_ids):
-                logger.info(f"Processing message {idx+1}/{len(message_ids)}: {msg_id}")
-                try:
-                    fetch_response = await client.fetch(msg_id, '(RFC822)')
-                    
-                    if fetch_response.result != 'OK':
-                        logger.warning(
-                            f"Failed to fetch message {msg_id} from {account['email']}"
+            logger.info("Found %d unseen emails in %s", len(message_ids), email)
+            
+            emails = list(retried)
+            pending_parse: Optional[asyncio.Task] = None
+            # The mark only moves past a batch once its emails are in `emails`,
+            # and is committed only when they are returned to the caller
+            mark = last_uid
+            pending_mark = None
+            
+            try:
+                # One FETCH round trip per batch instead of one per message; the
+                # previous batch is parsed in threads while the next is fetched
+                for batch in batched(message_ids, FETCH_BATCH_SIZE):
+                    if deadline is not None and time.monotonic() >= deadline:
+                        logger.info(
+                            "Fetch deadline reached for %s, continuing next cycle",
+                            email
                         )
-                        continue
+                        break
                     
-                    # Extract raw email from IMAP response
-                    # Response format varies by server, try multiple approaches
-                    raw_email = None
+                    candidates = await self._filter_reply_candidates(client, email, batch)
                     
-                    # Debug: log response structure
-                    logger.debug(f"FETCH response has {len(fetch_response.lines)} lines")
+                    # Stop on failure so the high-water mark never skips this batch
+                    if candidates is None:
+                        break
                     
-                    for idx, line in enumerate(fetch_response.lines):
-                        logger.debug(f"Line {idx}: type={type(line)}, len={len(line) if isinstance(line, (bytes, bytearray, tuple, list)) else 'N/A'}")
-                        
-                        # Approach 1: Tuple with email data
-                        if isinstance(line, tuple):
-                            for part in line:
-                                if isinstance(part, (bytes, bytearray)) and len(part) > 100:
-                                    raw_email = bytes(part) if isinstance(part, bytearray) else part
-                                    logger.debug(f"Found email in tuple part, size={len(part)}")
-                                    break
-                        
-                        # Approach 2: Direct bytes or bytearray with email headers
-                        elif isinstance(line, (bytes, bytearray)):
-                            if len(line) > 100 and (b'From:' in line or b'Return-Path:' in line or b'Received:' in line):
-                                raw_email = bytes(line) if isinstance(line, bytearray) else line
-                                logger.debug(f"Found email as direct bytes/bytearray, size={len(line)}")
-                                break
-                            # Sometimes the email is in a smaller chunk
-                            elif b'RFC822' in line:
-                                # Next line might have the email
-                                if idx + 1 < len(fetch_response.lines):
-                                    next_line = fetch_response.lines[idx + 1]
-                                    if isinstance(next_line, (bytes, bytearray)) and len(next_line) > 100:
-                                        raw_email = bytes(next_line) if isinstance(next_line, bytearray) else next_line
-                                        logger.debug(f"Found email in next line after RFC822, size={len(next_line)}")
-                                        break
-                        
-                        if raw_email:
-                            break
+                    # UIDs are sorted, so the last one is the batch's highest
+                    batch_mark = int(batch[-1])
                     
-                    if not raw_email:
-                        logger.warning(
-                            f"Could not extract raw email for message {msg_id}, "
-                            f"response lines: {len(fetch_response.lines)}, "
-                            f"line types: {[type(l).__name__ for l in fetch_response.lines]}"
-                        )
+                    if not candidates:
+                        # Nothing to return from this batch; it is covered as
+                        # soon as every earlier batch is
+                        if pending_parse:
+                            pending_mark = batch_mark
+                        else:
+                            mark = batch_mark
                         continue
                     
-                    logger.info(f"Successfully extracted raw email for message {msg_id}")
-                    
-                    parsed = parse_email(raw_email)
-                    parsed['account_email'] = account['email']
-                    parsed['imap_uid'] = msg_id.decode() if isinstance(msg_id, bytes) else msg_id
-                    
-                    logger.info(
-                        f"Parsed email: subject='{parsed.get('subject', 'N/A')}', "
-                        f"from={parsed.get('from_email', 'N/A')}"
+                    fetch_response = await client.uid(
+                        'fetch', b','.join(candidates).decode(), fetch_items
                     )
                     
-                    emails.append(parsed)
+                    if fetch_response.result != 'OK':
+                        logger.warning(
+                            f"Failed to fetch {len(candidates)} messages from {email}"
+                        )
+                        break
+                    
+                    messages = []
+                    for msg_id, meta, raw_email in split_fetch_response(fetch_response.lines):
+                        if not raw_email:
+                            logger.warning("Could not extract raw email for message %s", msg_id)
+                            continue
+                        messages.append((msg_id, meta, raw_email))
                     
+                    if pending_parse:
+                        # Cleared first so a failed parse is not awaited again below
+                        parse, pending_parse = pending_parse, None
+                        emails.extend(await parse)
+                        mark = pending_mark
+                    pending_parse = asyncio.create_task(
+                        self._parse_batch(email, is_gmail, messages)
+                    )
+                    pending_mark = batch_mark
+            
+            except asyncio.CancelledError:
+                # Nothing is returned, so the mark stays where it was
+                if pending_parse:
+                    pending_parse.cancel()
+                raise
+            
+            except Exception as e:
+                # Keep the batches already fetched; the failed one and those
+                # after it stay above the mark and are retried next cycle
+                logger.error(
+                    f"Error fetching emails from {email} after "
+                    f"{len(emails)} parsed: {e}",
+                    exc_info=True
+                )
+                self._discard_connection(email)
+            
+            # The batch in flight was fetched successfully; finish parsing it
+            # rather than throwing it away
+            if pending_parse:
+                try:
+                    emails.extend(await pending_parse)
+                    mark = pending_mark
                 except Exception as e:
+                    # Its UIDs stay above the mark and are fetched next cycle
                     logger.error(
-                        f"Error parsing message {msg_id} from {account['email']}: {e}",
+                        f"Error parsing last batch from {email}: {e}",
                         exc_info=True
                     )
-                    continue
+            
+            if mark is not None and mark != last_uid:
+                self.highest_seen_uid[email] = mark
+                self._unprocessed_uids.setdefault(email, set()).update(
+                    int(parsed['imap_uid']) for parsed in emails
+                )
+                await self._save_uid_state(email)
             
             return emails
+        
+        except asyncio.CancelledError:
+            # Re-fetched emails were not handed back; try them again next cycle
+            if retried:
+                self._retry_uids.setdefault(email, set()).update(
+                    int(parsed['imap_uid']) for parsed in retried
+                )
+            raise
             
         except Exception as e:
             logger.error(
-                f"Error fetching emails from {account['email']}: {e}",
+                f"Error fetching emails from {email}: {e}",
                 exc_info=True
             )
+            # Liveness is not probed on every call, so reconnect next cycle
+            self._discard_connection(email)
+            return retried
+    
+    async def _refetch_failed(
+        self,
+        client: aioimaplib.IMAP4_SSL,
+        email: str,
+        is_gmail: bool,
+        fetch_items: str
+    ) -> List[Dict]:
+        """
+        Fetch again the emails whose processing failed.
+        
+        They are below the high-water mark, so the UID search never returns
+        them again. UIDs the server no longer has (expunged) are released.
+        
+        Args:
+            client: Connected IMAP client with INBOX selected
+            email: Account email
+            is_gmail: Whether to request X-GM-MSGID
+            fetch_items: FETCH items used for new emails
+            
+        Returns:
+            List of parsed email dicts (empty if the fetch failed; the UIDs
+            are then retried next cycle)
+        """
+        uids = sorted(self._retry_uids[email])
+        
+        response = await client.uid('fetch', ','.join(map(str, uids)), fetch_items)
+        
+        if response.result != 'OK':
+            logger.warning(f"Failed to re-fetch {len(uids)} messages from {email}")
             return []
+        
+        messages = [
+            message for message in split_fetch_response(response.lines) if message[2]
+        ]
+        emails = await self._parse_batch(email, is_gmail, messages)
+        
+        self._retry_uids.pop(email, None)
+        
+        # Nothing left to retry for UIDs that did not come back as an email
+        returned = {int(parsed['imap_uid']) for parsed in emails}
+        gone = [uid for uid in uids if uid not in returned]
+        if gone:
+            unprocessed = self._unprocessed_uids.get(email, set())
+            attempts = self._process_attempts.get(email, {})
+            for uid in gone:
+                unprocessed.discard(uid)
+                attempts.pop(uid, None)
+            await self._save_uid_state(email)
+        
+        logger.info("Re-fetched %d failed emails in %s", len(emails), email)
+        return emails
+    
+    async def _track_uid_validity(self, email: str, select_response):
+        """
+        Record INBOX UIDVALIDITY from a SELECT response.
+        
+        A changed UIDVALIDITY invalidates the UID high-water mark; the
+        persisted mark is restored the first time the account is selected.
+        
+        Args:
+            email: Account email
+            select_response: aioimaplib response of SELECT INBOX
+        """
+        validity = _UIDVALIDITY_RE.search(b' '.join(
+            line for line in select_response.lines if type(line) is bytes
+        ))
+        validity = validity.group(1).decode() if validity else None
+        
+        if validity != self.uid_validity.get(email):
+            self.uid_validity[email] = validity
+            self.highest_seen_uid.pop(email, None)
+            self._unprocessed_uids.pop(email, None)
+            self._saved_uid.pop(email, None)
+            self._retry_uids.pop(email, None)
+            self._process_attempts.pop(email, None)
+        
+        await self._load_uid_state(email, validity)
+    
+    async def _load_uid_state(self, email: str, validity: Optional[str]):
+        """
+        Restore the persisted UID high-water mark once per process.
+        
+        The mark is only used if it belongs to the mailbox's current
+        UIDVALIDITY; otherwise the first search falls back to UNSEEN only.
+        
+        Args:
+            email: Account email
+            validity: Current INBOX UIDVALIDITY
+        """
+        if self.redis_client is None or email in self._uid_state_loaded:
+            return
+        
+        self._uid_state_loaded.add(email)
+        
+        try:
+            state = await self.redis_client.hgetall(self.UID_STATE_KEY.format(email=email))
+        except Exception as e:
+            logger.warning(f"Could not load UID state for {email}: {e}")
+            return
+        
+        if state and state.get('uid') and state.get('validity') == (validity or ''):
+            self.highest_seen_uid[email] = self._saved_uid[email] = int(state['uid'])
+            logger.info(f"Resuming {email} after UID {state['uid']}")
+    
+    async def _save_uid_state(self, email: str):
+        """
+        Persist the UID high-water mark for account.
+        
+        The persisted mark never passes an email that was fetched but not
+        yet processed, so emails lost to a crash or an interrupted shutdown
+        are fetched again after a restart.
+        
+        Args:
+            email: Account email
+        """
+        if self.redis_client is None or email not in self.highest_seen_uid:
+            return
+        
+        uid = self.highest_seen_uid[email]
+        unprocessed = self._unprocessed_uids.get(email)
+        if unprocessed:
+            uid = min(uid, min(unprocessed) - 1)
+        
+        if self._saved_uid.get(email) == uid:
+            return
+        
+        try:
+            await self.redis_client.hset(
+                self.UID_STATE_KEY.format(email=email),
+                mapping={
+                    'validity': self.uid_validity.get(email) or '',
+                    'uid': uid
+                }
+            )
+            self._saved_uid[email] = uid
+        except Exception as e:
+            logger.warning(f"Could not save UID state for {email}: {e}")
+    
+    async def mark_processed(self, email_data: Dict):
+        """
+        Record that a fetched email has been fully processed.
+        
+        Lets the persisted UID mark move past the email.
+        
+        Args:
+            email_data: Parsed email dict as returned by fetch_new_replies
+        """
+        email = email_data.get('account_email')
+        uid = email_data.get('imap_uid')
+        unprocessed = self._unprocessed_uids.get(email)
+        
+        if not unprocessed or uid is None:
+            return
+        
+        uid = int(uid)
+        unprocessed.discard(uid)
+        self._process_attempts.get(email, {}).pop(uid, None)
+        await self._save_uid_state(email)
+    
+    async def mark_failed(self, email_data: Dict):
+        """
+        Record that processing a fetched email failed.
+        
+        The email is fetched again next cycle, and the persisted UID mark
+        stays below it, until MAX_PROCESS_ATTEMPTS have failed; it is then
+        left unread in the mailbox for a human.
+        
+        Args:
+            email_data: Parsed email dict as returned by fetch_new_replies
+        """
+        email = email_data.get('account_email')
+        uid = email_data.get('imap_uid')
+        unprocessed = self._unprocessed_uids.get(email)
+        
+        if not unprocessed or uid is None or int(uid) not in unprocessed:
+            return
+        
+        uid = int(uid)
+        attempts = self._process_attempts.setdefault(email, {})
+        attempts[uid] = attempts.get(uid, 0) + 1
+        
+        if attempts[uid] < MAX_PROCESS_ATTEMPTS:
+            self._retry_uids.setdefault(email, set()).add(uid)
+            return
+        
+        logger.error(
+            "Giving up on UID %d in %s after %d failed attempts",
+            uid, email, MAX_PROCESS_ATTEMPTS
+        )
+        await self.mark_processed(email_data)
+    
+    async def _filter_reply_candidates(
+        self,
+        client: aioimaplib.IMAP4_SSL,
+        email: str,
+        uids: Tuple[bytes, ...]
+    ) -> Optional[List[bytes]]:
+        """
+        Fetch only the reply-relevant headers and keep replies to outreach.
+        
+        A few hundred bytes per message decide whether the message content
+        is worth transferring at all.
+        
+        Args:
+            client: Connected IMAP client with INBOX selected
+            email: Account email (for logging)
+            uids: UIDs to check
+            
+        Returns:
+            UIDs that pass is_reply_to_outreach, or None if the fetch failed
+        """
+        response = await client.uid('fetch', b','.join(uids).decode(), _ENVELOPE_FETCH)
+        
+        if response.result != 'OK':
+            logger.warning(f"Failed to fetch headers of {len(uids)} messages from {email}")
+            return None
+        
+        candidates = []
+        for uid, _, raw_headers in split_fetch_response(response.lines):
+            if raw_headers and self.is_reply_to_outreach(parse_headers_only(raw_headers)):
+                candidates.append(uid.encode())
+        
+        return candidates
+    
+    async def _parse_batch(
+        self,
+        email: str,
+        is_gmail: bool,
+        messages: List[Tuple[str, bytes, bytes]]
+    ) -> List[Dict]:
+        """
+        Parse one FETCH batch in a worker thread.
+        
+        Runs off the event loop so MIME decoding neither blocks other
+        accounts nor the next FETCH on this one. The whole batch is parsed
+        in a single thread hand-off with the shared parser.
+        
+        Args:
+            email: Account email the messages belong to
+            is_gmail: Whether metadata carries X-GM-MSGID
+            messages: (uid, metadata, raw email) tuples from split_fetch_response
+            
+        Returns:
+            List of parsed email dicts (messages that fail to parse are skipped)
+        """
+        results = await asyncio.to_thread(parse_many, [raw for _, _, raw in messages])
+        
+        emails = []
+        for (msg_id, meta, _), parsed in zip(messages, results):
+            if isinstance(parsed, Exception):
+                logger.error(
+                    "Error parsing message %s from %s: %s", msg_id, email, parsed,
+                    exc_info=parsed
+                )
+                continue
+            
+            parsed['account_email'] = email
+            parsed['imap_uid'] = msg_id
+            
+            gm_match = _GM_MSGID_RE.search(meta) if is_gmail else None
+            parsed['gm_msgid'] = gm_match.group(1).decode() if gm_match else None
+            
+            logger.info(
+                "Parsed email: subject='%s', from=%s",
+                parsed.get('subject', 'N/A'), parsed.get('from_email', 'N/A')
+            )
+            
+            emails.append(parsed)
+        
+        return emails
     
     def is_reply_to_outreach(self, email_data: Dict) -> bool:
         """
@@ -308,7 +884,7 @@ class IMAPWatcher:
         
         Filters based on:
         - Has thread_id (is a reply, not new message)
-        - Subject contains "Re:" or similar reply indicators
+        - Subject starts with "Re:", "Fwd:" or a localized equivalent
         
         Args:
             email_data: Parsed email dict
@@ -318,53 +894,53 @@ class IMAPWatcher:
         """
         thread_id = email_data.get('thread_id', '')
         message_id = email_data.get('message_id', '')
-        subject = email_data.get('subject', '').lower()
-        
-        # Debug logging
-        logger.debug(
-            f"Checking if reply: subject='{subject}', "
-            f"thread_id='{thread_id[:50] if thread_id else 'None'}', "
-            f"message_id='{message_id[:50] if message_id else 'None'}', "
-            f"is_different={thread_id != message_id}"
-        )
+        subject = email_data.get('subject') or ''
+        debug = logger.isEnabledFor(logging.DEBUG)
+        
+        if debug:
+            logger.debug(
+                f"Checking if reply: subject='{subject}', "
+                f"thread_id='{thread_id[:50] if thread_id else 'None'}', "
+                f"message_id='{message_id[:50] if message_id else 'None'}', "
+                f"is_different={thread_id != message_id}"
+            )
         
         if thread_id and thread_id != message_id:
-            logger.info(f"Email identified as reply (different thread_id): {subject}")
+            logger.info("Email identified as reply (different thread_id): %s", subject)
             return True
         
-        if subject.startswith('re:') or subject.startswith('fwd:'):
-            logger.info(f"Email identified as reply (Re:/Fwd: in subject): {subject}")
+        if _REPLY_PREFIX_RE.match(subject):
+            logger.info("Email identified as reply (reply prefix in subject): %s", subject)
             return True
         
-        logger.debug(f"Email NOT identified as reply: {subject}")
+        if debug:
+            logger.debug("Email NOT identified as reply: %s", subject)
         return False
     
-    async def watch_account(self, account: Dict[str, str]) -> List[Dict]:
+    async def watch_account(
+        self,
+        account: Account,
+        date_str: Optional[str] = None,
+        deadline: Optional[float] = None
+    ) -> List[Dict]:
         """
         Watch single account for new replies.
         
-        Fetches unseen emails and filters for replies to outreach.
+        Fetches unseen emails that are replies to outreach (filtered on
+        their headers before the content is fetched).
         
         Args:
-            account: Account config dict
+            account: Account to use
+            date_str: SEARCH SINCE date (computed if not given)
+            deadline: Monotonic time after which no new FETCH batch is started
             
         Returns:
             List of reply emails
         """
         try:
-            emails = await self.fetch_new_replies(account)
-            
-            logger.info(f"Filtering {len(emails)} emails for replies to outreach...")
+            replies = await self.fetch_new_replies(account, date_str, deadline)
             
-            replies = [
-                email for email in emails
-                if self.is_reply_to_outreach(email)
-            ]
-            
-            logger.info(
-                f"Found {len(replies)} replies to outreach out of {len(emails)} total emails "
-                f"in {account['email']}"
-            )
+            logger.info("Found %d replies to outreach in %s", len(replies), account.email)
             
             if replies:
                 logger.info(
@@ -375,17 +951,204 @@ class IMAPWatcher:
             
         except IMAPAuthenticationError:
             logger.error(
-                f"Authentication error for {account['email']} - skipping this account"
+                f"Authentication error for {account.email} - skipping this account"
             )
             return []
             
         except Exception as e:
             logger.error(
-                f"Error watching account {account['email']}: {e}",
+                f"Error watching account {account.email}: {e}",
                 exc_info=True
             )
             return []
     
+    def next_poll_deadline(self, previous: float) -> float:
+        """
+        Advance a monotonic polling deadline by one interval.
+        
+        Ticks already missed by an overrunning cycle are skipped rather than
+        replayed, so a slow cycle never triggers back-to-back polls.
+        
+        Args:
+            previous: Previous deadline (time.monotonic() based)
+            
+        Returns:
+            Next deadline that is not in the past
+        """
+        deadline = previous + self.polling_interval
+        now = time.monotonic()
+        
+        if deadline < now:
+            missed = (now - deadline) // self.polling_interval + 1
+            deadline += missed * self.polling_interval
+        
+        return deadline
+    
+    async def _sleep_until(self, deadline: Optional[float]):
+        """Sleep until a monotonic deadline, or one polling interval if none."""
+        if deadline is None:
+            await asyncio.sleep(self.polling_interval)
+        else:
+            await asyncio.sleep(max(0.0, deadline - time.monotonic()))
+    
+    async def idle_wait(
+        self,
+        account: Account,
+        deadline: Optional[float] = None
+    ) -> None:
+        """
+        Block until the server pushes new mail for account or IDLE times out.
+        
+        Falls back to polling (sleeping until deadline) when the server does
+        not advertise IDLE or the IDLE session fails.
+        
+        Args:
+            account: Account to use
+            deadline: Monotonic time of the next poll for the fallback path
+                (one polling interval from now if not given)
+        """
+        try:
+            client = await self.ensure_connection(account)
+            
+            if not client.has_capability('IDLE'):
+                await self._sleep_until(deadline)
+                return
+            
+            idle = await client.idle_start(timeout=IDLE_TIMEOUT_SECONDS)
+            
+            try:
+                while client.has_pending_idle():
+                    lines = await client.wait_server_push()
+                    
+                    if lines == aioimaplib.STOP_WAIT_SERVER_PUSH:
+                        break
+                    
+                    if any(
+                        type(line) is bytes and line.endswith((b'EXISTS', b'RECENT'))
+                        for line in lines
+                    ):
+                        logger.debug(f"IDLE push for {account.email}: {lines}")
+                        break
+            finally:
+                client.idle_done()
+                try:
+                    await asyncio.wait_for(idle, timeout=5)
+                except Exception:
+                    pass
+        
+        except asyncio.CancelledError:
+            raise
+        
+        except Exception as e:
+            logger.warning(
+                f"IDLE failed for {account.email}, falling back to polling: {e}"
+            )
+            self._discard_connection(account.email)
+            await self._sleep_until(deadline)
+    
+    async def idle_account(
+        self,
+        account: Account,
+        callback=None,
+        offset: float = 0.0
+    ):
+        """
+        Watch one account continuously.
+        
+        Fetches new replies, hands them to callback, then IDLEs until the
+        server pushes new mail (or the polling deadline passes when IDLE is
+        unavailable). Each account runs its own loop, so a push on one
+        account never triggers a re-poll of the others.
+        
+        Args:
+            account: Account to watch
+            callback: Async function to call with list of new replies
+            offset: Seconds to wait before the first poll, to stagger accounts
+        """
+        if offset:
+            await asyncio.sleep(offset)
+        
+        next_tick = time.monotonic()
+        
+        while self.running:
+            try:
+                replies = await self._watch_account_bounded(account, since_date_str())
+                
+                if replies and callback:
+                    await callback(replies)
+            
+            except Exception as e:
+                logger.error(
+                    f"Error in watcher loop for {account.email}: {e}",
+                    exc_info=True
+                )
+            
+            # Polls stay aligned to the interval regardless of cycle duration
+            next_tick = self.next_poll_deadline(next_tick)
+            await self.idle_wait(account, next_tick)
+    
+    async def _watch_account_bounded(
+        self,
+        account: Account,
+        date_str: str
+    ) -> List[Dict]:
+        """
+        Watch one account, giving up after a share of the polling interval.
+        
+        A large backlog stops starting new FETCH batches before the timeout
+        and returns what it has; only a stuck account is cancelled (and its
+        connection dropped) so it cannot hold up the next cycle for the others.
+        
+        Args:
+            account: Account to use
+            date_str: SEARCH SINCE date for this cycle
+            
+        Returns:
+            List of reply emails (empty on timeout)
+        """
+        timeout = self.polling_interval * ACCOUNT_TIMEOUT_FRACTION
+        deadline = time.monotonic() + timeout * FETCH_DEADLINE_FRACTION
+        
+        try:
+            return await asyncio.wait_for(
+                self.watch_account(account, date_str, deadline),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Watching {account.email} exceeded {timeout:.0f}s, "
+                "dropping connection"
+            )
+            self._discard_connection(account.email)
+            return []
+    
+    async def iter_account_replies(self) -> AsyncIterator[List[Dict]]:
+        """
+        Watch all configured accounts concurrently, streaming results.
+        
+        Yields each account's replies as soon as that account finishes, so
+        a slow account does not delay delivery of the others' replies.
+        
+        Yields:
+            Non-empty list of replies from one account
+        """
+        # One SINCE date for the whole cycle instead of one per account
+        date_str = since_date_str()
+        tasks = [
+            self._watch_account_bounded(account, date_str)
+            for account in self.accounts
+        ]
+        
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                replies = await next_done
+            except Exception as e:
+                logger.error(f"Account watch failed: {e}")
+                continue
+            
+            if replies:
+                yield replies
+    
     async def watch_all_accounts(self) -> List[Dict]:
         """
         Watch all configured accounts concurrently.
@@ -393,24 +1156,19 @@ class IMAPWatcher:
         Returns:
             Combined list of replies from all accounts
         """
-        tasks = [self.watch_account(account) for account in self.accounts]
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
         all_replies = []
-        for result in results:
-            if isinstance(result, Exception):
-                logger.error(f"Account watch failed: {result}")
-            elif isinstance(result, list):
-                all_replies.extend(result)
+        async for replies in self.iter_account_replies():
+            all_replies.extend(replies)
         
         return all_replies
     
     async def start(self, callback=None):
         """
-        Start watching all accounts with polling loop.
+        Start watching all accounts.
         
-        Polls accounts at regular intervals and calls callback with new replies.
+        Runs one idle_account loop per account: check for new replies, then
+        wait for an IDLE push (or the polling interval when IDLE is
+        unavailable) before checking again.
         
         Args:
             callback: Async function to call with list of new replies
@@ -418,27 +1176,34 @@ class IMAPWatcher:
         self.running = True
         logger.info(
             f"Starting IMAP watcher for {len(self.accounts)} accounts "
-            f"(polling every {self.polling_interval}s)"
+            f"(IDLE, polling fallback every {self.polling_interval}s)"
         )
         
-        while self.running:
-            try:
-                replies = await self.watch_all_accounts()
-                
-                if replies and callback:
-                    await callback(replies)
-                
-                await asyncio.sleep(self.polling_interval)
-                
-            except Exception as e:
-                logger.error(f"Error in watcher loop: {e}", exc_info=True)
-                await asyncio.sleep(self.polling_interval)
+        await self.warm_pool()
+        
+        # Spread first polls evenly over one interval so the accounts do not
+        # hit the server (and each other's processing) at the same moment
+        stagger = self.polling_interval / max(len(self.accounts), 1)
+        
+        await asyncio.gather(
+            *(
+                self.idle_account(account, callback, offset=i * stagger)
+                for i, account in enumerate(self.accounts)
+            )
+        )
     
     async def stop(self):
         """Stop the watcher and close all connections."""
         self.running = False
         logger.info("Stopping IMAP watcher")
         
+        if self._keep_alive_task and not self._keep_alive_task.done():
+            self._keep_alive_task.cancel()
+            try:
+                await self._keep_alive_task
+            except asyncio.CancelledError:
+                pass
+        
         for email, client in self.connections.items():
             if client:
                 try:
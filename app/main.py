@@ -2,8 +2,8 @@
 Main application loop for automated follow-up system.
 
 Orchestrates the complete email processing pipeline:
-1. Poll IMAP for new replies (every 60 seconds)
-2. Process emails concurrently (max 10 at a time)
+1. Watch IMAP for new replies (IDLE push, 60 second polling fallback)
+2. Process emails concurrently (pool of 10 queue workers)
 3. Run scheduler checks (every 15 minutes)
 
 Uses asyncio for concurrent processing with proper error handling
@@ -12,9 +12,14 @@ and graceful shutdown.
 
 import asyncio
 import signal
-from typing import List, Dict
+from typing import List, Dict, Optional, Set, Tuple
 from datetime import datetime
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from app.config import settings
 from app.db.prisma_client import db
 from app.core.scheduler import scheduler
@@ -35,6 +40,23 @@ from app.utils.logger import (
 
 logger = get_logger(__name__)
 
+# How long shutdown waits for queued emails to finish before cancelling workers
+SHUTDOWN_DRAIN_TIMEOUT_SECONDS = 30
+
+# How long shutdown then waits for emails already being processed by
+# cancelled workers before closing the connections they use
+SHUTDOWN_INFLIGHT_TIMEOUT_SECONDS = 15
+
+# How long Seen-flag changes are collected before one bulk STORE per account
+FLAG_FLUSH_DELAY_SECONDS = 0.5
+
+# Failed Seen-flag STOREs are retried after this delay, this many times in total
+FLAG_RETRY_DELAY_SECONDS = 5
+FLAG_FLUSH_MAX_ATTEMPTS = 3
+
+# Thread statuses that need no further processing when a new reply arrives
+TERMINAL_STATUSES = frozenset({'DELEGATED', 'COMPLETED'})
+
 
 class Application:
     """
@@ -42,7 +64,7 @@ class Application:
     
     Manages the complete lifecycle of the automated follow-up system:
     - IMAP watching for new replies
-    - Concurrent email processing with semaphore
+    - Concurrent email processing by a fixed pool of queue workers
     - Scheduler for delayed follow-ups
     - Graceful shutdown on signals
     """
@@ -50,15 +72,30 @@ class Application:
     def __init__(self):
         self.running = False
         self.watcher: IMAPWatcher = None
-        self.semaphore = asyncio.Semaphore(settings.max_concurrent_workers)
+        # Bounded so a large backlog applies backpressure to the watcher
+        # instead of holding every pending email in memory
+        self._inq: asyncio.Queue = asyncio.Queue(
+            maxsize=settings.max_concurrent_workers * 2
+        )
+        self.worker_tasks: List[asyncio.Task] = []
+        # Shielded process_email tasks, which outlive a cancelled worker
+        self._inflight: Set[asyncio.Task] = set()
         self.scheduler_task = None
         self.watcher_task = None
+        self._shutdown_task: asyncio.Task = None
+        # Seen-flag changes per account, flushed as one UID STORE each
+        self._pending_seen: Dict[str, List[str]] = {}
+        self._pending_unseen: Dict[str, List[str]] = {}
+        self._flags_pending = asyncio.Event()
+        self._flag_task: asyncio.Task = None
+        # Failed STORE attempts per (account, uid), for bounded retries
+        self._flag_attempts: Dict[Tuple[str, str], int] = {}
     
     async def initialize(self):
         """
         Initialize all system components.
         
-        Connects to database, Redis, and prepares IMAP watcher.
+        Connects to database, Redis, and opens IMAP watcher connections.
         """
         logger.info("Initializing application...")
         
@@ -71,21 +108,57 @@ class Application:
         logger.info("Redis connected")
         
         # Initialize IMAP watcher
-        self.watcher = IMAPWatcher(polling_interval=settings.polling_interval)
+        self.watcher = IMAPWatcher(
+            polling_interval=settings.polling_interval,
+            redis_client=scheduler.redis_client
+        )
+        await self.watcher.warm_pool()
         logger.info("IMAP watcher initialized")
         
+        # Start email processing workers
+        self.worker_tasks = [
+            asyncio.create_task(self._worker(i))
+            for i in range(settings.max_concurrent_workers)
+        ]
+        logger.info(f"Started {len(self.worker_tasks)} email workers")
+        
+        self._flag_task = asyncio.create_task(self._flag_flusher())
+        
         logger.info("Application initialized successfully")
     
     async def shutdown(self):
         """
         Gracefully shutdown all system components.
         
-        Stops watcher, scheduler, and closes all connections.
+        Safe to call more than once (signal handler and main's cleanup):
+        every caller awaits the same shielded shutdown task, so it always
+        runs to completion exactly once.
+        """
+        if self._shutdown_task is None:
+            self._shutdown_task = asyncio.create_task(self._shutdown())
+        
+        await asyncio.shield(self._shutdown_task)
+    
+    async def _shutdown(self):
+        """
+        Stop producers, drain queued emails, then close all connections.
+        
+        Workers are only cancelled once the queue is empty (or the drain
+        timeout expires), so emails are not abandoned halfway through their
+        DB updates and IMAP flag changes.
         """
         logger.info("Shutting down application...")
         
         self.running = False
         
+        # Stop producing new work first so the queue can drain
+        if self.watcher_task and not self.watcher_task.done():
+            self.watcher_task.cancel()
+            try:
+                await self.watcher_task
+            except asyncio.CancelledError:
+                pass
+        
         # Stop watcher
         if self.watcher:
             await self.watcher.stop()
@@ -102,21 +175,53 @@ class Application:
             except asyncio.CancelledError:
                 pass
         
-        if self.watcher_task and not self.watcher_task.done():
-            self.watcher_task.cancel()
+        # Let workers finish everything already queued
+        if self.worker_tasks:
             try:
-                await self.watcher_task
-            except asyncio.CancelledError:
-                pass
+                await asyncio.wait_for(
+                    self._inq.join(), timeout=SHUTDOWN_DRAIN_TIMEOUT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Shutdown drain timed out with {self._inq.qsize()} emails queued"
+                )
+        
+        for task in self.worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self.worker_tasks, return_exceptions=True)
+        self.worker_tasks = []
+        
+        # Emails shielded from that cancellation still need the DB and IMAP
+        if self._inflight:
+            _, pending = await asyncio.wait(
+                set(self._inflight), timeout=SHUTDOWN_INFLIGHT_TIMEOUT_SECONDS
+            )
+            if pending:
+                logger.warning(
+                    f"Closing connections with {len(pending)} emails still processing"
+                )
+        
+        # Apply flag changes still waiting for the flusher
+        if self._flag_task:
+            self._flag_task.cancel()
+            await asyncio.gather(self._flag_task, return_exceptions=True)
+            self._flag_task = None
+        while await self._flush_flags():
+            pass
         
         # Close connections
         await controller.close_all()
+        await sender.close_all()
         await scheduler.close()
         await db.close()
         
         logger.info("Application shutdown complete")
     
-    async def process_email(self, email_data: Dict) -> bool:
+    async def process_email(
+        self,
+        email_data: Dict,
+        received_at: Optional[datetime] = None
+    ) -> bool:
         """
         Process a single email through the complete pipeline.
         
@@ -128,6 +233,7 @@ class Application:
         
         Args:
             email_data: Parsed email dict from IMAP watcher
+            received_at: When the email's batch arrived (default: now)
             
         Returns:
             True if processed successfully, False otherwise
@@ -138,31 +244,35 @@ class Application:
         subject = email_data.get('subject', '')
         body = email_data.get('body', '')
         thread_id = email_data.get('thread_id')
+        gm_msgid = email_data.get('gm_msgid')
         
         if not message_id or not body:
-            logger.warning(f"Invalid email data: missing message_id or body")
+            logger.warning("Invalid email data: missing message_id or body")
             return False
         
         # Log email received
         log_email_received(message_id, creator_email, account_email)
         
         try:
-            # Check if thread already processed and delegated/completed
+            # Single lookup, reused for the short-circuit, routing and insert
             existing_thread = await db.get_thread(message_id)
+            
+            # Check if thread already processed and delegated/completed
             if existing_thread:
                 status = existing_thread.get('status')
-                if status in ['DELEGATED', 'COMPLETED']:
+                if status in TERMINAL_STATUSES:
                     logger.info(
-                        f"Thread {message_id} already processed with status {status}, skipping"
+                        "Thread %s already processed with status %s, skipping",
+                        message_id, status
                     )
                     # Ensure delegated emails remain unread for human review
                     if status == 'DELEGATED':
-                        await controller.mark_as_unread(account_email, message_id)
-                        logger.info(f"Ensured {message_id} is marked as unread for human review")
+                        await self._set_seen(email_data, seen=False)
+                        logger.info("Ensured %s is marked as unread for human review", message_id)
                     return True
             
             # Route email to determine action
-            decision = await route_email(message_id, body)
+            decision = await route_email(message_id, body, existing_thread)
             
             action = decision['action']
             reason = decision['reason']
@@ -176,34 +286,31 @@ class Application:
                 log_intent_classified(message_id, intent, has_contact)
             
             logger.info(
-                f"Decision for {message_id}: {action.value} (reason: {reason})"
+                "Decision for %s: %s (reason: %s)", message_id, action.value, reason
             )
             
-            # Check if thread already exists
-            existing_thread = await db.get_thread(message_id)
-            
             if not existing_thread:
                 # Insert new thread
-                received_at = datetime.now()
                 thread_db_id = await db.insert_thread(
                     message_id=message_id,
                     thread_id=thread_id,
                     account_email=account_email,
                     creator_email=creator_email,
                     subject=subject,
-                    received_at=received_at,
+                    received_at=received_at or datetime.now(),
                     intent=analysis.get('intent'),
                     has_contact=analysis.get('has_phone', False) or analysis.get('has_address', False),
-                    status=update_fields.get('status', 'PROCESSING')
+                    status=update_fields.get('status', 'PROCESSING'),
+                    gm_msgid=gm_msgid
                 )
                 
                 if thread_db_id is None:
                     logger.warning(
-                        f"Thread {message_id} already exists (race condition), "
-                        f"skipping insert"
+                        "Thread %s already exists (race condition), skipping insert",
+                        message_id
                     )
                 else:
-                    logger.info(f"Created new thread record for {message_id}")
+                    logger.info("Created new thread record for %s", message_id)
             
             # Update thread with decision results
             await db.update_thread(message_id, **update_fields)
@@ -211,50 +318,53 @@ class Application:
             # Execute action
             if action == Action.SEND_STAGE_1_FOLLOWUP:
                 # Mark email as read
-                await controller.mark_as_read(account_email, message_id)
+                await self._set_seen(email_data, seen=True)
                 
-                # Send Stage 1 follow-up
-                thread_data = await db.get_thread(message_id)
-                if thread_data:
-                    success = await sender.send_followup(thread_data, stage=1)
+                # Send Stage 1 follow-up using the row as just written, merged
+                # in memory instead of re-reading it
+                thread_data = existing_thread or {
+                    'message_id': message_id,
+                    'account_email': account_email,
+                    'creator_email': creator_email,
+                    'subject': subject,
+                    'failed_sends': 0
+                }
+                thread_data = {**thread_data, **update_fields}
+                success = await sender.send_followup(thread_data, stage=1)
+                
+                if success:
+                    # Log follow-up sent
+                    log_followup_sent(message_id, 1, creator_email)
+                    
+                    # Schedule Stage 2 for 24 hours later
+                    await scheduler.schedule_followup(
+                        message_id=message_id,
+                        stage=2,
+                        delay_hours=24
+                    )
+                    
+                    # Log follow-up scheduled
+                    log_followup_scheduled(message_id, 2, 24)
                     
-                    if success:
-                        # Log follow-up sent
-                        log_followup_sent(message_id, 1, creator_email)
-                        
-                        # Schedule Stage 2 for 24 hours later
-                        await scheduler.schedule_followup(
-                            message_id=message_id,
-                            stage=2,
-                            delay_hours=24
-                        )
-                        
-                        # Log follow-up scheduled
-                        log_followup_scheduled(message_id, 2, 24)
-                        
-                        logger.info(
-                            f"Sent Stage 1 follow-up and scheduled Stage 2 "
-                            f"for {message_id}"
-                        )
-                    else:
-                        logger.error(
-                            f"Failed to send Stage 1 follow-up for {message_id}"
-                        )
+                    logger.info(
+                        "Sent Stage 1 follow-up and scheduled Stage 2 for %s",
+                        message_id
+                    )
                 else:
                     logger.error(
-                        f"Could not retrieve thread data for {message_id}"
+                        "Failed to send Stage 1 follow-up for %s", message_id
                     )
             
             elif action == Action.DELEGATE_TO_HUMAN:
                 # Mark email as unread for human attention
-                await controller.mark_as_unread(account_email, message_id)
+                await self._set_seen(email_data, seen=False)
                 
                 # Log delegation
                 log_delegated_to_human(message_id, reason)
                 
                 logger.info(
-                    f"Marked {message_id} as unread for human review "
-                    f"(reason: {reason})"
+                    "Marked %s as unread for human review (reason: %s)",
+                    message_id, reason
                 )
                 
                 # Cancel any scheduled follow-ups
@@ -265,102 +375,273 @@ class Application:
             
             elif action == Action.MARK_COMPLETE:
                 # Mark email as read
-                await controller.mark_as_read(account_email, message_id)
+                await self._set_seen(email_data, seen=True)
                 
                 # Log automation stopped
                 log_automation_stopped(message_id, reason)
                 
                 logger.info(
-                    f"Marked {message_id} as complete (reason: {reason})"
+                    "Marked %s as complete (reason: %s)", message_id, reason
                 )
                 
                 # Cancel any scheduled follow-ups
                 await scheduler.cancel_followup(message_id)
             
             elif action == Action.SKIP:
-                logger.info(f"Skipping {message_id} (reason: {reason})")
+                logger.info("Skipping %s (reason: %s)", message_id, reason)
             
             return True
         
         except Exception as e:
             logger.error(
-                f"Error processing email {message_id}: {e}",
+                "Error processing email %s: %s", message_id, e,
                 exc_info=True
             )
             return False
     
-    async def safe_process_email(self, email_data: Dict):
+    async def _set_seen(self, email_data: Dict, seen: bool):
         """
-        Process email with semaphore for concurrency control.
+        Mark an email as read or unread.
         
-        Limits concurrent processing to max_concurrent_workers using semaphore.
+        Emails carrying the watcher's IMAP UID are queued for the next bulk
+        STORE; others fall back to an immediate Message-ID lookup.
         
         Args:
             email_data: Parsed email dict from IMAP watcher
+            seen: True to mark as read, False to mark as unread
         """
-        async with self.semaphore:
-            await self.process_email(email_data)
+        account_email = email_data.get('account_email')
+        uid = email_data.get('imap_uid')
+        
+        if uid:
+            pending = self._pending_seen if seen else self._pending_unseen
+            pending.setdefault(account_email, []).append(uid)
+            self._flags_pending.set()
+            return
+        
+        message_id = email_data.get('message_id')
+        gm_msgid = email_data.get('gm_msgid')
+        if seen:
+            await controller.mark_as_read(account_email, message_id, gm_msgid)
+        else:
+            await controller.mark_as_unread(account_email, message_id, gm_msgid)
     
-    async def process_batch(self, emails: List[Dict]):
+    async def _flush_flags(self) -> bool:
         """
-        Process a batch of emails concurrently.
+        Send all pending Seen-flag changes, one bulk STORE per account.
         
-        Uses asyncio.gather with return_exceptions=True to handle errors
-        gracefully without stopping other email processing.
+        Accounts are flushed concurrently, but an account's read and unread
+        STOREs run one after the other on its single connection.
         
-        Args:
-            emails: List of parsed email dicts
+        Returns:
+            True if some UIDs failed and were queued again for a retry
         """
-        if not emails:
-            return
+        seen, self._pending_seen = self._pending_seen, {}
+        unseen, self._pending_unseen = self._pending_unseen, {}
         
-        logger.info(f"Processing batch of {len(emails)} emails")
+        results = await asyncio.gather(*(
+            self._flush_account_flags(
+                account, seen.get(account, []), unseen.get(account, [])
+            )
+            for account in seen.keys() | unseen.keys()
+        ))
+        return any(results)
+    
+    async def _flush_account_flags(
+        self,
+        account_email: str,
+        seen_uids: List[str],
+        unseen_uids: List[str]
+    ) -> bool:
+        """
+        Apply one account's pending flag changes, read first, then unread.
         
-        # Process all emails concurrently with semaphore limiting concurrency
-        results = await asyncio.gather(
-            *[self.safe_process_email(email) for email in emails],
-            return_exceptions=True
-        )
+        Args:
+            account_email: Account the UIDs belong to
+            seen_uids: UIDs to mark as read
+            unseen_uids: UIDs to mark as unread
+            
+        Returns:
+            True if some UIDs failed and were queued again for a retry
+        """
+        requeued = False
         
-        # Log any exceptions
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
+        for uids, seen in ((seen_uids, True), (unseen_uids, False)):
+            if not uids:
+                continue
+            
+            store = controller.mark_as_read_bulk if seen else controller.mark_as_unread_bulk
+            try:
+                success = await store(account_email, uids)
+            except Exception as e:
                 logger.error(
-                    f"Exception processing email {i}: {result}",
-                    exc_info=result
+                    f"Error storing Seen flags for {account_email}: {e}", exc_info=True
                 )
+                success = False
+            
+            if success:
+                if self._flag_attempts:
+                    for uid in uids:
+                        self._flag_attempts.pop((account_email, uid), None)
+            else:
+                requeued |= self._requeue_flags(account_email, uids, seen)
+        
+        return requeued
+    
+    def _requeue_flags(self, account_email: str, uids: List[str], seen: bool) -> bool:
+        """
+        Queue UIDs of a failed STORE again, dropping those out of attempts.
         
-        success_count = sum(1 for r in results if r is True)
-        logger.info(
-            f"Batch complete: {success_count}/{len(emails)} processed successfully"
+        Args:
+            account_email: Account the UIDs belong to
+            uids: UIDs whose STORE failed
+            seen: Whether they were being marked as read
+            
+        Returns:
+            True if any UID was queued again
+        """
+        retry = []
+        for uid in uids:
+            key = (account_email, uid)
+            attempts = self._flag_attempts.get(key, 0) + 1
+            if attempts >= FLAG_FLUSH_MAX_ATTEMPTS:
+                self._flag_attempts.pop(key, None)
+            else:
+                self._flag_attempts[key] = attempts
+                retry.append(uid)
+        
+        dropped = len(uids) - len(retry)
+        if dropped:
+            logger.error(
+                f"Giving up marking {dropped} messages as "
+                f"{'read' if seen else 'unread'} in {account_email} "
+                f"after {FLAG_FLUSH_MAX_ATTEMPTS} attempts"
+            )
+        
+        if not retry:
+            return False
+        
+        logger.warning(
+            f"Retrying {'read' if seen else 'unread'} flag for {len(retry)} "
+            f"messages in {account_email}"
         )
+        pending = self._pending_seen if seen else self._pending_unseen
+        pending.setdefault(account_email, []).extend(retry)
+        self._flags_pending.set()
+        return True
     
-    async def run_watcher_loop(self):
+    async def _flag_flusher(self):
         """
-        Run IMAP watcher loop.
+        Flush queued flag changes shortly after the first one arrives.
         
-        Polls IMAP servers for new replies and processes them in batches.
+        The short delay lets the rest of a batch accumulate, so a batch of
+        N emails costs one STORE per account instead of N searches and STOREs.
+        Failed STOREs are retried after FLAG_RETRY_DELAY_SECONDS.
         """
-        logger.info("Starting IMAP watcher loop")
+        while True:
+            await self._flags_pending.wait()
+            await asyncio.sleep(FLAG_FLUSH_DELAY_SECONDS)
+            self._flags_pending.clear()
+            
+            try:
+                if await self._flush_flags():
+                    await asyncio.sleep(FLAG_RETRY_DELAY_SECONDS)
+            except Exception as e:
+                logger.error(f"Error flushing IMAP flags: {e}", exc_info=True)
+    
+    async def _worker(self, worker_id: int):
+        """
+        Process emails from the queue until cancelled.
         
-        while self.running:
+        max_concurrent_workers of these run for the application's lifetime,
+        which bounds concurrency without a per-email coroutine and semaphore.
+        
+        Args:
+            worker_id: Worker index (for logging)
+        """
+        while True:
+            email_data, received_at = await self._inq.get()
+            success = False
+            
             try:
-                # Fetch new replies from all accounts
-                replies = await self.watcher.watch_all_accounts()
-                
-                if replies:
-                    # Process batch concurrently
-                    await self.process_batch(replies)
-                
-                # Wait for next polling interval
-                await asyncio.sleep(settings.polling_interval)
+                # Shielded so a cancelled worker never interrupts an email
+                # halfway through its DB and IMAP updates; tracked so
+                # shutdown can wait for it before closing connections
+                task = asyncio.create_task(
+                    self.process_email(email_data, received_at)
+                )
+                self._inflight.add(task)
+                task.add_done_callback(self._inflight.discard)
+                success = await asyncio.shield(task)
+                if not success:
+                    logger.warning(
+                        "Worker %d failed to process %s",
+                        worker_id, email_data.get('message_id')
+                    )
             
             except Exception as e:
                 logger.error(
-                    f"Error in watcher loop: {e}",
+                    "Worker %d exception processing email: %s", worker_id, e,
                     exc_info=True
                 )
-                await asyncio.sleep(settings.polling_interval)
+            
+            finally:
+                self._inq.task_done()
+            
+            # Only a processed email lets the persisted UID mark move past
+            # it; a failed one is fetched again next cycle, and one
+            # interrupted by cancellation is fetched again after a restart
+            try:
+                if success:
+                    await self.watcher.mark_processed(email_data)
+                else:
+                    await self.watcher.mark_failed(email_data)
+            except Exception as e:
+                logger.warning(
+                    "Could not record outcome of %s: %s",
+                    email_data.get('message_id'), e
+                )
+    
+    async def process_batch(self, emails: List[Dict]):
+        """
+        Queue a batch of emails for processing.
+        
+        Emails are handed to the worker pool as queue space frees up, so
+        memory stays proportional to the number of workers rather than
+        the batch size.
+        
+        Args:
+            emails: List of parsed email dicts
+        """
+        if not emails:
+            return
+        
+        logger.info(f"Queueing batch of {len(emails)} emails")
+        
+        # One timestamp for the whole batch; it arrived in a single fetch
+        batch_now = datetime.now()
+        
+        for email in emails:
+            await self._inq.put((email, batch_now))
+    
+    async def run_watcher_loop(self):
+        """
+        Run IMAP watcher loop.
+        
+        Each account fetches new replies and then IDLEs until new mail
+        arrives (polling as a fallback); replies are processed in batches
+        as soon as their account delivers them.
+        """
+        logger.info("Starting IMAP watcher loop")
+        
+        try:
+            await self.watcher.start(callback=self.process_batch)
+        
+        except Exception as e:
+            logger.error(
+                f"Error in watcher loop: {e}",
+                exc_info=True
+            )
     
     async def run_scheduler_loop(self):
         """
@@ -424,6 +705,7 @@ async def main():
     
     def signal_handler():
         logger.info("Received shutdown signal")
+        # Creates the shared shutdown task; main's cleanup awaits the same one
         asyncio.create_task(app.shutdown())
     
     for sig in (signal.SIGTERM, signal.SIGINT):
@@ -447,5 +729,18 @@ async def main():
         await app.shutdown()
 
 
+def run():
+    """
+    Run the application on uvloop when it is installed.
+    
+    uvloop's libuv-based event loop is a drop-in replacement for asyncio's
+    default selector loop; without it the standard loop is used.
+    """
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    run()
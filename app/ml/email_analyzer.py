@@ -6,12 +6,25 @@ for efficiency and cost reduction.
 """
 
 import asyncio
+import hashlib
 import json
+import random
+import re
+import time
+import httpx
+import groq
 import phonenumbers
-from typing import Dict, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from langchain_groq import ChatGroq
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages import HumanMessage, SystemMessage
 
 from app.config import settings
 from app.utils.logger import get_logger
@@ -26,66 +39,475 @@ INTENT_CLARIFICATION = "CLARIFICATION"
 INTENT_CONTACT_PROVIDED = "CONTACT_PROVIDED"
 INTENT_CONTINUE_OVER_EMAIL = "CONTINUE_OVER_EMAIL"
 
+VALID_INTENTS = frozenset({
+    INTENT_INTERESTED,
+    INTENT_NOT_INTERESTED,
+    INTENT_CLARIFICATION,
+    INTENT_CONTACT_PROVIDED,
+    INTENT_CONTINUE_OVER_EMAIL
+})
+# Longest first so "NOT_INTERESTED" is matched before "INTERESTED"
+_INTENTS_LONGEST_FIRST = tuple(sorted(VALID_INTENTS, key=len, reverse=True))
+
 ANALYSIS_TIMEOUT = 10.0
 MAX_RETRIES = 2
+MAX_BACKOFF_SECONDS = 30
+
+# Transient failures worth retrying; anything else fails fast
+RETRIABLE_ERRORS = (
+    asyncio.TimeoutError,
+    groq.RateLimitError,
+    groq.APIConnectionError,
+    groq.InternalServerError
+)
+
+# Keep-alive pool shared by all concurrent Groq calls
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# Exact-match result cache for short, frequently repeated replies
+CACHE_MAX_ENTRIES = 10_000
+CACHE_TTL_SECONDS = 3600
+CACHE_MAX_BODY_CHARS = 2000
+
+# JSON object/array inside a Markdown code fence, with or without "json"
+_FENCE_RE = re.compile(r'```(?:json)?\s*(\{.*?\}|\[.*?\])\s*```', re.S)
+
+# Runs of anything but letters/digits; collapsed so trivially different
+# replies ("No thanks!", "no thanks.", "No, thanks") match the same
+# fast-classify phrase
+_REPLY_NORMALIZE_RE = re.compile(r'[\W_]+')
+
+
+def _normalize_reply(text: str) -> str:
+    """Lowercase text and collapse punctuation and whitespace to single spaces."""
+    return _REPLY_NORMALIZE_RE.sub(' ', text.lower()).strip()
+
+
+# Rule-based prefilter for short, unambiguous replies (see _fast_classify).
+# A reply is only fast-classified when its whole normalized text is one of
+# these phrases; anything else ("not really interested", "yes I saw it but
+# no") goes to the LLM, so negations can never be misread as interest
+FAST_CLASSIFY_MAX_CHARS = 300
+_DECLINE_REPLIES = frozenset(map(_normalize_reply, (
+    "Not interested", "Not interested, thanks", "Not interested, thank you",
+    "No thanks", "No thank you", "No thanks, not interested",
+    "No thank you, not interested", "No, not interested",
+    "Unsubscribe", "Remove me", "Please remove me", "Please unsubscribe me",
+    "I'll pass", "I will pass", "Not for me", "Not for me, thanks"
+)))
+_INTEREST_REPLIES = frozenset(map(_normalize_reply, (
+    "Interested", "I'm interested", "I am interested", "Yes, interested",
+    "Yes, I'm interested", "Yes, I am interested", "Very interested",
+    "Sounds good", "Sounds good, tell me more", "Tell me more",
+    "Yes, tell me more", "Let's chat", "Yes", "Yes please"
+)))
+# Text allowed around a phone number for it to count as a plain hand-off
+_CONTACT_LEADINS = frozenset(map(_normalize_reply, (
+    "", "Call me", "Call me on", "Call me at", "Reach me at", "Reach me on",
+    "You can reach me at", "You can reach me on", "My number is",
+    "My number", "Here is my number", "Here's my number", "Phone", "Mobile",
+    "WhatsApp", "WhatsApp me on", "Text me at"
+)))
+# At least 7 digits (the shortest valid number) joined only by phone separators
+_PHONE_CANDIDATE_RE = re.compile(r'\+?\d(?:[\s\-()./]*\d){6,}')
+_DIGIT_RE = re.compile(r'\d')
+
+MAX_PHONE_DIGITS = 15
+
+# Micro-batching of concurrent analyses (enabled by ANALYSIS_BATCH_SIZE > 1);
+# capped because classification quality drops with larger batches
+BATCH_WINDOW_SECONDS = 0.01
+MAX_ANALYSIS_BATCH = 8
 
 
-class EmailAnalyzer:
-    """
-    Unified email analyzer that extracts intent and contact info in single LLM call.
-    
-    More efficient than separate calls for classification and extraction.
-    """
-    
-    def __init__(self):
-        """Initialize the email analyzer with Groq API."""
-        if not settings.groq_api_key:
-            raise ValueError("GROQ_API_KEY must be configured in settings")
-        
-        self.llm = ChatGroq(
-            model="llama-3.1-8b-instant",
-            temperature=0,
-            groq_api_key=settings.groq_api_key,
-            max_tokens=400
-        )
-        
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", self._get_system_prompt()),
-            ("user", "Analyze this email:\n\n{email_text}")
-        ])
-        
-        self.chain = self.prompt | self.llm
-    
-    def _get_system_prompt(self) -> str:
-        """Build unified analysis prompt."""
-        return """You are an email analyzer for creator outreach responses. Analyze the email and extract:
+
+# Static so every request sends a byte-identical prefix, which Groq's
+# automatic prompt caching can reuse.
+SYSTEM_PROMPT = """You are an email analyzer for creator outreach responses. Analyze the email and extract:
 
 1. INTENT - Classify into exactly ONE category:
-   - INTERESTED: Shows interest or engagement ("Yes interested", "Tell me more", "Sounds good")
-   - NOT_INTERESTED: Declines or no interest ("No thanks", "Not interested", "I'll pass")
+   - INTERESTED: Shows interest or engagement ("Yes interested", "Tell me more")
+   - NOT_INTERESTED: Declines or no interest ("No thanks", "I'll pass")
    - CLARIFICATION: Asks questions ("What's the retainer?", "How does this work?")
    - CONTACT_PROVIDED: Shares contact details (phone, WhatsApp, address)
    - CONTINUE_OVER_EMAIL: Wants email discussion ("Let's continue over email", "Email me details")
 
-2. CONTACT INFORMATION:
-   - Phone numbers (including WhatsApp) - extract if sender is sharing their contact
-   - Physical address - extract if sender is sharing their address
-   - ONLY extract if sender is actually providing their own contact info
-   - DON'T extract if just mentioned in conversation
+2. CONTACT INFORMATION the sender shares as their own (not merely mentions):
+   - Phone numbers (including WhatsApp)
+   - Physical address
 
-Return JSON with this EXACT structure:
-{{
+Return JSON with this structure:
+{
   "intent": "INTENT_CATEGORY",
   "phone_numbers": ["list of phone numbers if provided"],
   "has_address": true/false,
   "address_text": "full address if provided, otherwise null"
-}}
+}
 
 Rules:
 - If contact info is provided, intent should be CONTACT_PROVIDED
 - If interested but no contact info, intent should be INTERESTED
-- If ambiguous, use CLARIFICATION for human review
-- Only extract contact info the sender is actually sharing"""
+- If ambiguous, use CLARIFICATION for human review"""
+
+
+class AnalysisCache:
+    """
+    LRU cache of analysis results with a per-entry TTL.
+    
+    Keyed by a digest of the lowercased email body with whitespace
+    collapsed, so repeated short replies that differ only in case or
+    spacing skip the LLM. Punctuation is kept: "Interested?" is not
+    "Interested." and "+44 ..." is not "44 ...".
+    Long bodies are never cached to bound memory and because they are
+    unlikely to repeat.
+    """
+    
+    def __init__(self, maxsize: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+    
+    @staticmethod
+    def key(email_body: str) -> Optional[bytes]:
+        """Return the cache key for a body, or None if it should not be cached."""
+        if len(email_body) > CACHE_MAX_BODY_CHARS:
+            return None
+        normalized = ' '.join(email_body.lower().split())
+        return hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+    
+    def get(self, key: bytes) -> Optional[Dict[str, any]]:
+        """Return a copy of a fresh cached result, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        # Copy so callers cannot mutate the cached result
+        return {**result, 'phone_numbers': list(result['phone_numbers'])}
+    
+    def set(self, key: bytes, result: Dict[str, any]):
+        """Store a result, evicting the least recently used entry if full."""
+        self._entries[key] = (time.monotonic() + self.ttl, result)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class AsyncTokenBucket:
+    """
+    Client-side request rate limiter for the Groq API.
+    
+    Callers wait locally for a token instead of sending a request that
+    Groq would reject with 429. After a 429, penalize() blocks every
+    caller until the server's Retry-After has passed. Waiters are served
+    in arrival order.
+    """
+    
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Args:
+            rate: Tokens added per second (0 disables the steady-state cap)
+            burst: Bucket capacity (default: one second's worth, at least 1)
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                
+                if self.rate <= 0:
+                    return
+                
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+    
+    def penalize(self, retry_after: float):
+        """
+        Block all callers for retry_after seconds.
+        
+        Args:
+            retry_after: Cooldown requested by the server, in seconds
+        """
+        self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        self._tokens = 0
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Return the Retry-After of a Groq 429 response, if it carries one."""
+    response = getattr(error, 'response', None)
+    if response is None:
+        return None
+    
+    try:
+        return float(response.headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+class BatchAnalyzer:
+    """
+    Coalesce concurrent analyses into a single multi-email LLM call.
+    
+    Requests arriving within a short window (or until max_batch is reached)
+    share one Groq round trip and one system-prompt prefill. If the batched
+    response cannot be matched back to its emails, each email is analyzed
+    on its own instead.
+    """
+    
+    def __init__(
+        self,
+        analyzer: 'EmailAnalyzer',
+        max_batch: int,
+        window: float = BATCH_WINDOW_SECONDS
+    ):
+        self.analyzer = analyzer
+        self.max_batch = max_batch
+        self.window = window
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+    
+    async def submit(self, email_body: str) -> Optional[Dict[str, any]]:
+        """
+        Queue an email for the next batch and wait for its result.
+        
+        Args:
+            email_body: The email text to analyze
+            
+        Returns:
+            Analysis dict, or None if analysis failed
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((email_body, future))
+        return await future
+    
+    async def _run(self):
+        """Collect queued emails into batches and dispatch them."""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Dispatch without waiting so the next window starts immediately
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+    
+    async def _dispatch(self, batch: list):
+        """Analyze one batch and resolve each caller's future."""
+        bodies = [body for body, _ in batch]
+        results = None
+        
+        if len(batch) > 1:
+            try:
+                await self.analyzer.rate_limiter.acquire()
+                results = await asyncio.wait_for(
+                    self.analyzer._analyze_batch_with_llm(bodies),
+                    timeout=ANALYSIS_TIMEOUT
+                )
+            except Exception as e:
+                self.analyzer._note_rate_limit(e)
+                logger.warning(f"Batched analysis of {len(batch)} emails failed: {e}")
+            
+            if results is None:
+                logger.warning(
+                    f"Falling back to single analysis for {len(batch)} emails"
+                )
+        
+        if results is None:
+            results = await asyncio.gather(
+                *(self.analyzer._analyze_with_retry(body) for body in bodies),
+                return_exceptions=True
+            )
+        
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+@lru_cache(maxsize=4096)
+def _to_e164(phone_str: str) -> Optional[str]:
+    """
+    Parse a phone number, trying each configured region in turn.
+    
+    Numbers written with a country code ('+...') parse the same under any
+    region, so they take a single pass; local formats fall back through
+    settings.phone_region_list.
+    Cached because the same numbers recur across a thread's replies and
+    phonenumbers parsing is pure Python.
+    
+    Args:
+        phone_str: Phone number as written in the email
+        
+    Returns:
+        Number in E164 format, or None if no region yields a valid number
+    """
+    # Cheap C-level prefilter: LLM output such as "N/A" or "not provided"
+    # never reaches phonenumbers
+    if not _PHONE_CANDIDATE_RE.search(phone_str):
+        return None
+    
+    # E.164 numbers have at most 15 digits
+    if sum(c.isdigit() for c in phone_str) > MAX_PHONE_DIGITS:
+        return None
+    
+    regions = (None,) if phone_str.lstrip().startswith('+') else settings.phone_region_list
+    
+    for region in regions:
+        try:
+            parsed = phonenumbers.parse(phone_str, region)
+        except phonenumbers.NumberParseException:
+            continue
+        
+        if phonenumbers.is_valid_number(parsed):
+            return phonenumbers.format_number(
+                parsed,
+                phonenumbers.PhoneNumberFormat.E164
+            )
+    
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _fast_intent(email_body: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+    """
+    Apply the fast-classify rules to a short reply.
+    
+    Cached on the body text because the same short replies ("No thanks",
+    a bare phone number) recur constantly.
+    
+    Args:
+        email_body: The email text to check
+        
+    Returns:
+        Tuple of (intent, E164 phone numbers), or None if no rule
+        applies and the LLM should classify the email
+    """
+    normalized = _normalize_reply(email_body)
+    
+    if normalized in _DECLINE_REPLIES:
+        return INTENT_NOT_INTERESTED, ()
+    if normalized in _INTEREST_REPLIES:
+        return INTENT_INTERESTED, ()
+    
+    # A body without digits cannot hold a phone number
+    if not _DIGIT_RE.search(email_body):
+        return None
+    
+    candidates = _PHONE_CANDIDATE_RE.findall(email_body)
+    if not candidates:
+        return None
+    
+    # Only a number with a neutral lead-in; "don't call me on ..." goes to the LLM
+    if _normalize_reply(_PHONE_CANDIDATE_RE.sub(' ', email_body)) not in _CONTACT_LEADINS:
+        return None
+    
+    phones = tuple(dict.fromkeys(
+        e164 for e164 in map(_to_e164, dict.fromkeys(candidates)) if e164
+    ))
+    if not phones:
+        return None
+    
+    return INTENT_CONTACT_PROVIDED, phones
+
+
+class EmailAnalyzer:
+    """
+    Unified email analyzer that extracts intent and contact info in single LLM call.
+    
+    More efficient than separate calls for classification and extraction.
+    """
+    
+    def __init__(self):
+        """Initialize the email analyzer with Groq API."""
+        if not settings.groq_api_key:
+            raise ValueError("GROQ_API_KEY must be configured in settings")
+        
+        http_client = httpx.AsyncClient(limits=HTTP_LIMITS)
+        self.llm = self._create_llm(settings.groq_model, http_client)
+        
+        # Built once; requests are plain message lists, skipping
+        # prompt-template rendering on every call
+        self._system_msg = SystemMessage(content=SYSTEM_PROMPT)
+        
+        # Two-tier cascade: the fallback model only sees emails whose
+        # primary-model reply could not be parsed
+        self.fallback_llm = None
+        if settings.groq_model_fallback:
+            self.fallback_llm = self._create_llm(
+                settings.groq_model_fallback, http_client
+            )
+        
+        self.cache = AnalysisCache()
+        self.rate_limiter = AsyncTokenBucket(settings.groq_rps)
+        
+        batch_size = min(settings.analysis_batch_size, MAX_ANALYSIS_BATCH)
+        self.batcher = BatchAnalyzer(self, batch_size) if batch_size > 1 else None
+        if self.batcher:
+            self.batch_llm = self.llm.bind(max_tokens=400 * batch_size)
+    
+    def _create_llm(self, model: str, http_client: httpx.AsyncClient) -> ChatGroq:
+        """
+        Create a Groq chat model sharing the analyzer's HTTP pool.
+        
+        Args:
+            model: Groq model name
+            http_client: Shared async HTTP client
+            
+        Returns:
+            Configured ChatGroq instance
+        """
+        return ChatGroq(
+            model=model,
+            temperature=0,
+            groq_api_key=settings.groq_api_key,
+            max_tokens=400,
+            # Retries are handled (with jitter) in _analyze_with_retry
+            max_retries=0,
+            # JSON mode: the API guarantees a single JSON object reply
+            model_kwargs={"response_format": {"type": "json_object"}},
+            http_async_client=http_client
+        )
     
     async def analyze_email(self, email_body: str) -> Dict[str, any]:
         """
@@ -106,26 +528,71 @@ Rules:
             logger.warning("Empty email body provided for analysis")
             return self._default_result(INTENT_CLARIFICATION)
         
+        cache_key = self.cache.key(email_body)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug("Analysis cache hit")
+                return cached
+        
+        fast_result = self._fast_classify(email_body)
+        if fast_result is not None:
+            return fast_result
+        
+        if self.batcher:
+            result = await self.batcher.submit(email_body)
+        else:
+            result = await self._analyze_with_retry(email_body)
+        
+        if result is None:
+            return self._default_result(INTENT_CLARIFICATION)
+        
+        # Only real LLM results are cached, never fallback defaults
+        if cache_key is not None:
+            self.cache.set(cache_key, result)
+            result = {**result, 'phone_numbers': list(result['phone_numbers'])}
+        return result
+    
+    async def _analyze_with_retry(self, email_body: str) -> Optional[Dict[str, any]]:
+        """
+        Analyze a single email, retrying transient failures.
+        
+        Timeouts, rate limits, connection errors and Groq 5xx responses are
+        retried with jittered exponential backoff; any other error fails
+        immediately.
+        
+        Args:
+            email_body: The email text to analyze
+            
+        Returns:
+            Analysis dict, or None if every attempt failed
+        """
         for attempt in range(MAX_RETRIES + 1):
             try:
-                result = await asyncio.wait_for(
+                # Outside the timeout so local rate-limit waits are not
+                # counted against the request
+                await self.rate_limiter.acquire()
+                return await asyncio.wait_for(
                     self._analyze_with_llm(email_body),
                     timeout=ANALYSIS_TIMEOUT
                 )
-                return result
                 
-            except asyncio.TimeoutError:
+            except RETRIABLE_ERRORS as e:
+                self._note_rate_limit(e)
+                reason = "timeout" if isinstance(e, asyncio.TimeoutError) else str(e)
                 if attempt == MAX_RETRIES:
                     logger.warning(
-                        f"LLM timeout after {MAX_RETRIES} retries, "
+                        f"LLM failed after {MAX_RETRIES} retries ({reason}), "
                         f"defaulting to CLARIFICATION"
                     )
-                    return self._default_result(INTENT_CLARIFICATION)
+                    return None
                 
-                backoff_delay = 2 ** attempt
+                backoff_delay = min(
+                    2 ** attempt + random.uniform(0, 1), MAX_BACKOFF_SECONDS
+                )
                 logger.warning(
-                    f"LLM timeout on attempt {attempt + 1}/{MAX_RETRIES + 1}, "
-                    f"retrying in {backoff_delay}s"
+                    f"LLM {reason} on attempt {attempt + 1}/{MAX_RETRIES + 1}, "
+                    f"retrying in {backoff_delay:.1f}s"
                 )
                 await asyncio.sleep(backoff_delay)
                 
@@ -134,9 +601,17 @@ Rules:
                     f"LLM analysis error on attempt {attempt + 1}: {e}, "
                     f"defaulting to CLARIFICATION"
                 )
-                return self._default_result(INTENT_CLARIFICATION)
+                return None
         
-        return self._default_result(INTENT_CLARIFICATION)
+        return None
+    
+    def _note_rate_limit(self, error: Exception):
+        """Pause the rate limiter for the server's Retry-After on a 429."""
+        if isinstance(error, groq.RateLimitError):
+            retry_after = _retry_after_seconds(error)
+            if retry_after:
+                logger.warning(f"Groq rate limited, pausing requests for {retry_after}s")
+                self.rate_limiter.penalize(retry_after)
     
     async def _analyze_with_llm(self, email_body: str) -> Dict[str, any]:
         """
@@ -148,9 +623,75 @@ Rules:
         Returns:
             Dict with intent and contact info
         """
-        response = await self.chain.ainvoke({"email_text": email_body})
-        result = self._parse_response(response.content)
+        messages = [
+            self._system_msg,
+            HumanMessage(content=f"Analyze this email:\n\n{email_body}")
+        ]
+        response = await self.llm.ainvoke(messages)
+        
+        if self.fallback_llm is None:
+            return self._finalize_result(self._parse_response(response.content))
+        
+        try:
+            result = self._result_from_data(self._load_json(response.content))
+        except Exception as e:
+            logger.warning(
+                f"Unparseable response from {settings.groq_model} ({e}), "
+                f"retrying with {settings.groq_model_fallback}"
+            )
+            response = await self.fallback_llm.ainvoke(messages)
+            result = self._parse_response(response.content)
+        
+        return self._finalize_result(result)
+    
+    async def _analyze_batch_with_llm(self, email_bodies: list) -> Optional[list]:
+        """
+        Analyze several emails in one LLM call.
+        
+        Args:
+            email_bodies: Email texts to analyze
+            
+        Returns:
+            List of analysis dicts in input order, or None if the response
+            does not contain exactly one valid result per email
+        """
+        emails_text = "\n\n".join(
+            f"--- EMAIL {i} ---\n{body}" for i, body in enumerate(email_bodies, 1)
+        )
+        response = await self.batch_llm.ainvoke([
+            self._system_msg,
+            HumanMessage(content=(
+                f"Analyze each of these {len(email_bodies)} emails separately. "
+                'Return a JSON object {"results": [...]} whose list holds one '
+                "object per email, in the same order, each with the structure "
+                f"above.\n\n{emails_text}"
+            ))
+        ])
+        
+        try:
+            data = self._load_json(response.content)
+            items = data.get('results') if isinstance(data, dict) else data
+        except Exception as e:
+            logger.error(f"Failed to parse batched LLM response: {e}")
+            return None
+        
+        if not isinstance(items, list) or len(items) != len(email_bodies):
+            return None
+        if not all(isinstance(item, dict) for item in items):
+            return None
+        
+        return [self._finalize_result(self._result_from_data(item)) for item in items]
+    
+    def _finalize_result(self, result: Dict[str, any]) -> Dict[str, any]:
+        """
+        Validate extracted phone numbers and log the analysis.
         
+        Args:
+            result: Parsed analysis dict
+            
+        Returns:
+            The same dict with validated phone_numbers and has_phone set
+        """
         # Validate phone numbers
         result['phone_numbers'] = self._validate_phone_numbers(
             result.get('phone_numbers', [])
@@ -175,41 +716,65 @@ Rules:
             Dict with intent and contact info
         """
         try:
-            # Extract JSON from response
-            content = response_text.strip()
-            
-            if '```json' in content:
-                content = content.split('```json')[1].split('```')[0].strip()
-            elif '```' in content:
-                content = content.split('```')[1].split('```')[0].strip()
-            
-            data = json.loads(content)
-            
-            # Validate intent
-            intent = data.get('intent', '').upper()
-            valid_intents = {
-                INTENT_INTERESTED,
-                INTENT_NOT_INTERESTED,
-                INTENT_CLARIFICATION,
-                INTENT_CONTACT_PROVIDED,
-                INTENT_CONTINUE_OVER_EMAIL
-            }
-            
-            if intent not in valid_intents:
-                logger.warning(f"Invalid intent '{intent}', defaulting to CLARIFICATION")
-                intent = INTENT_CLARIFICATION
-            
-            return {
-                'intent': intent,
-                'phone_numbers': data.get('phone_numbers', []),
-                'has_address': data.get('has_address', False),
-                'address_text': data.get('address_text')
-            }
+            return self._result_from_data(self._load_json(response_text))
             
         except Exception as e:
             logger.error(f"Failed to parse LLM response: {e}")
             return self._default_result(INTENT_CLARIFICATION)
     
+    def _load_json(self, response_text: str):
+        """
+        Decode the JSON in an LLM response.
+        
+        JSON mode returns a bare object, which is decoded directly; the
+        code-fence search only runs if that fails.
+        
+        Args:
+            response_text: Raw LLM response
+            
+        Returns:
+            Decoded JSON value
+        """
+        if orjson is not None:
+            try:
+                return orjson.loads(response_text)
+            except orjson.JSONDecodeError:
+                pass
+        
+        match = _FENCE_RE.search(response_text)
+        content = match.group(1) if match else response_text.strip()
+        
+        # stdlib fallback (also used for its error message on bad JSON)
+        return json.loads(content)
+    
+    def _result_from_data(self, data: Dict) -> Dict[str, any]:
+        """
+        Build an analysis dict from one decoded JSON object.
+        
+        Args:
+            data: Decoded JSON object from the LLM
+            
+        Returns:
+            Dict with intent and contact info
+        """
+        # Validate intent; well-formed replies hit the set lookup, anything
+        # else (e.g. "Intent: INTERESTED") falls back to a substring scan
+        intent = str(data.get('intent') or '').strip().upper()
+        
+        if intent not in VALID_INTENTS:
+            found = next((i for i in _INTENTS_LONGEST_FIRST if i in intent), None)
+            if found is None:
+                logger.warning(f"Invalid intent '{intent}', defaulting to CLARIFICATION")
+                found = INTENT_CLARIFICATION
+            intent = found
+        
+        return {
+            'intent': intent,
+            'phone_numbers': data.get('phone_numbers', []),
+            'has_address': data.get('has_address', False),
+            'address_text': data.get('address_text')
+        }
+    
     def _validate_phone_numbers(self, phone_list: list) -> list:
         """
         Validate and normalize phone numbers.
@@ -221,31 +786,52 @@ Rules:
             List of validated phone numbers in E164 format
         """
         valid_numbers = []
+        seen = set()
         
-        for phone_str in phone_list:
-            if not phone_str:
-                continue
-            
-            try:
-                # Try parsing with region hints
-                for region in [None, 'US', 'GB', 'IN', 'CA', 'AU']:
-                    try:
-                        parsed = phonenumbers.parse(phone_str, region)
-                        if phonenumbers.is_valid_number(parsed):
-                            e164 = phonenumbers.format_number(
-                                parsed,
-                                phonenumbers.PhoneNumberFormat.E164
-                            )
-                            if e164 not in valid_numbers:
-                                valid_numbers.append(e164)
-                            break
-                    except Exception:
-                        continue
-            except Exception:
-                continue
+        # dict.fromkeys drops repeats while keeping the LLM's order
+        candidates = dict.fromkeys(
+            phone for phone in phone_list or [] if phone and isinstance(phone, str)
+        )
+        
+        for phone_str in candidates:
+            e164 = _to_e164(phone_str)
+            if e164 and e164 not in seen:
+                seen.add(e164)
+                valid_numbers.append(e164)
         
         return valid_numbers
     
+    def _fast_classify(self, email_body: str) -> Optional[Dict[str, any]]:
+        """
+        Classify trivially clear short replies without calling the LLM.
+        
+        Applies only to bodies under FAST_CLASSIFY_MAX_CHARS with no
+        question whose whole text is a known decline or interest phrase,
+        or a phone number with at most a neutral lead-in ("Call me on ...").
+        Everything else returns None so the LLM decides.
+        
+        Args:
+            email_body: The email text to analyze
+            
+        Returns:
+            Analysis dict, or None if the LLM should classify the email
+        """
+        if len(email_body) > FAST_CLASSIFY_MAX_CHARS or '?' in email_body:
+            return None
+        
+        fast = _fast_intent(email_body)
+        if fast is None:
+            return None
+        
+        intent, phones = fast
+        result = self._default_result(intent)
+        if phones:
+            result['phone_numbers'] = list(phones)
+            result['has_phone'] = True
+        
+        logger.info(f"Fast-classified email - Intent: {result['intent']}")
+        return result
+    
     def _default_result(self, intent: str) -> Dict[str, any]:
         """
         Return default result structure.
@@ -265,6 +851,22 @@ Rules:
         }
 
 
+_analyzer: Optional[EmailAnalyzer] = None
+
+
+def _get_analyzer() -> EmailAnalyzer:
+    """
+    Return the shared analyzer, creating it on first use.
+    
+    Created lazily so importing this module does not require GROQ_API_KEY,
+    and shared so the Groq HTTP connection pool and system message are reused.
+    """
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = EmailAnalyzer()
+    return _analyzer
+
+
 async def analyze_email(email_body: str) -> Dict[str, any]:
     """
     Convenience function to analyze a single email.
@@ -275,5 +877,4 @@ async def analyze_email(email_body: str) -> Dict[str, any]:
     Returns:
         Dict with intent, has_phone, has_address, phone_numbers, address_text
     """
-    analyzer = EmailAnalyzer()
-    return await analyzer.analyze_email(email_body)
+    return await _get_analyzer().analyze_email(email_body)
@@ -7,8 +7,10 @@ infinite retry loops.
 """
 
 import asyncio
-from typing import Optional, Dict
-from datetime import datetime
+import time
+from typing import Optional, Dict, List, Tuple
+from datetime import datetime, timezone
+from functools import lru_cache
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import aiosmtplib
@@ -38,6 +40,36 @@ STAGE_3_TEMPLATE = (
 )
 
 
+# Idle sessions kept per account; Gmail throttles many parallel sessions
+SMTP_POOL_SIZE = 3
+
+# Follow-ups sent in parallel by send_many (default and hard cap)
+SEND_CONCURRENCY = 5
+MAX_SEND_CONCURRENCY = 20
+
+# Pooled sessions idle longer than this are probed with NOOP before reuse,
+# since Gmail closes quiet SMTP sessions
+SMTP_NOOP_AFTER_SECONDS = 25
+
+
+@lru_cache(maxsize=1024)
+def _reply_subject(subject: str) -> str:
+    """
+    Return the subject with a "Re:" prefix for threading.
+    
+    Cached because the same thread subjects recur across follow-up stages.
+    
+    Args:
+        subject: Original subject line
+        
+    Returns:
+        Subject starting with "Re:"
+    """
+    if subject.startswith('Re:'):
+        return subject
+    return f"Re: {subject}"
+
+
 class SMTPSender:
     """
     SMTP sender for automated follow-up emails.
@@ -47,6 +79,7 @@ class SMTPSender:
     - Exponential backoff retry (2 retries)
     - Database failure tracking
     - Automatic error state marking after 3 failed sends
+    - Pooled, already-authenticated SMTP sessions per account
     """
     
     def __init__(self):
@@ -54,6 +87,14 @@ class SMTPSender:
         self.smtp_port = settings.smtp_port
         self.max_retries = 2
         self.max_failed_sends = 3
+        self.connect_timeout = settings.smtp_connect_timeout
+        self.login_timeout = settings.smtp_login_timeout
+        self.send_timeout = settings.smtp_send_timeout
+        self._passwords: Dict[str, str] = {}
+        self.reload_passwords()
+        # Idle sessions per account as (client, last used) stacks, so the
+        # most recently used (least likely to be dropped) is reused first
+        self._idle: Dict[str, List[Tuple[aiosmtplib.SMTP, float]]] = {}
     
     def get_template(self, stage: int) -> str:
         """
@@ -79,9 +120,16 @@ class SMTPSender:
         
         return templates[stage]
     
+    def reload_passwords(self):
+        """Snapshot app passwords for all configured accounts from settings."""
+        self._passwords = {
+            email: settings.get_account_password(email)
+            for email in settings.all_account_emails
+        }
+    
     def _get_account_password(self, account_email: str) -> Optional[str]:
         """
-        Get app password for Gmail account from settings.
+        Get app password for Gmail account from the startup snapshot.
         
         Args:
             account_email: Email address of the account
@@ -89,7 +137,7 @@ class SMTPSender:
         Returns:
             App password string, or None if not found
         """
-        password = settings.get_account_password(account_email)
+        password = self._passwords.get(account_email)
         if not password:
             logger.error(f"No password found for account: {account_email}")
         return password
@@ -109,7 +157,7 @@ class SMTPSender:
         Args:
             from_email: Sender email address
             to_email: Recipient email address
-            subject: Email subject (should match original for threading)
+            subject: Email subject (original; "Re:" is added if missing)
             body: Email body text
             in_reply_to: Message-ID of email being replied to
             references: Space-separated list of Message-IDs in thread
@@ -120,7 +168,7 @@ class SMTPSender:
         msg = MIMEMultipart()
         msg['From'] = from_email
         msg['To'] = to_email
-        msg['Subject'] = subject
+        msg['Subject'] = _reply_subject(subject)
         
         # Add threading headers for proper conversation grouping
         if in_reply_to:
@@ -133,10 +181,89 @@ class SMTPSender:
             msg['References'] = in_reply_to
         
         # Attach body as plain text
-        msg.attach(MIMEText(body, 'plain'))
+        msg.attach(MIMEText(body, 'plain', 'utf-8'))
         
         return msg
     
+    async def _get_conn(self, account_email: str, password: str) -> aiosmtplib.SMTP:
+        """
+        Check out an authenticated SMTP session for an account.
+        
+        Reuses an idle pooled session when one is still alive, so STARTTLS
+        and AUTH are only paid when a new session is needed.
+        
+        Args:
+            account_email: Account to send from
+            password: Gmail app password
+            
+        Returns:
+            Connected and logged-in SMTP client
+        """
+        idle = self._idle.setdefault(account_email, [])
+        
+        while idle:
+            smtp, last_used = idle.pop()
+            if not smtp.is_connected:
+                continue
+            
+            if time.monotonic() - last_used > SMTP_NOOP_AFTER_SECONDS:
+                try:
+                    await asyncio.wait_for(smtp.noop(), timeout=self.login_timeout)
+                except (aiosmtplib.SMTPException, OSError, TimeoutError):
+                    smtp.close()
+                    continue
+            
+            return smtp
+        
+        smtp = aiosmtplib.SMTP(
+            hostname=self.smtp_server,
+            port=self.smtp_port,
+            use_tls=False,
+            start_tls=True
+        )
+        try:
+            await asyncio.wait_for(smtp.connect(), timeout=self.connect_timeout)
+            await asyncio.wait_for(
+                smtp.login(account_email, password), timeout=self.login_timeout
+            )
+        except BaseException:
+            smtp.close()
+            raise
+        
+        return smtp
+    
+    async def _release_conn(self, account_email: str, smtp: aiosmtplib.SMTP):
+        """
+        Return a session to the pool, or close it if the pool is full.
+        
+        Args:
+            account_email: Account the session is logged in as
+            smtp: Session to return
+        """
+        idle = self._idle.setdefault(account_email, [])
+        
+        if smtp.is_connected and len(idle) < SMTP_POOL_SIZE:
+            idle.append((smtp, time.monotonic()))
+            return
+        
+        await self._quit(smtp)
+    
+    async def _quit(self, smtp: aiosmtplib.SMTP):
+        """Close a session politely, falling back to dropping the socket."""
+        try:
+            await smtp.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            smtp.close()
+    
+    async def close_all(self):
+        """Close all pooled SMTP sessions."""
+        idle, self._idle = self._idle, {}
+        
+        await asyncio.gather(
+            *(self._quit(smtp) for sessions in idle.values() for smtp, _ in sessions),
+            return_exceptions=True
+        )
+    
     async def _send_with_retry(
         self,
         from_email: str,
@@ -159,26 +286,28 @@ class SMTPSender:
         Returns:
             True if sent successfully, False if all retries failed
         """
+        # Flatten the MIME tree once instead of on every attempt
+        raw_message = message.as_bytes()
+        
         for attempt in range(self.max_retries + 1):
+            smtp = None
             try:
-                async with aiosmtplib.SMTP(
-                    hostname=self.smtp_server,
-                    port=self.smtp_port,
-                    use_tls=False,
-                    start_tls=True
-                ) as smtp:
-                    await smtp.login(from_email, password)
-                    await smtp.send_message(message)
-                    
-                    if attempt > 0:
-                        logger.info(
-                            f"Email sent successfully on retry {attempt} "
-                            f"to {to_email}"
-                        )
-                    else:
-                        logger.info(f"Email sent successfully to {to_email}")
-                    
-                    return True
+                smtp = await self._get_conn(from_email, password)
+                await asyncio.wait_for(
+                    smtp.sendmail(from_email, [to_email], raw_message),
+                    timeout=self.send_timeout
+                )
+                await self._release_conn(from_email, smtp)
+                
+                if attempt > 0:
+                    logger.info(
+                        f"Email sent successfully on retry {attempt} "
+                        f"to {to_email}"
+                    )
+                else:
+                    logger.info(f"Email sent successfully to {to_email}")
+                
+                return True
             
             except aiosmtplib.SMTPAuthenticationError as e:
                 logger.error(
@@ -193,6 +322,10 @@ class SMTPSender:
                 TimeoutError,
                 OSError
             ) as e:
+                # Never return a session in an unknown state to the pool
+                if smtp is not None:
+                    smtp.close()
+                
                 if attempt == self.max_retries:
                     logger.error(
                         f"Failed to send email after {self.max_retries + 1} attempts "
@@ -274,10 +407,6 @@ class SMTPSender:
             return False
         
         # Compose email with threading headers
-        # Ensure subject starts with "Re:" for proper threading
-        if not subject.startswith('Re:'):
-            subject = f"Re: {subject}"
-        
         message = self._compose_email(
             from_email=account_email,
             to_email=creator_email,
@@ -302,7 +431,7 @@ class SMTPSender:
         
         if success:
             # Record successful send in database
-            sent_at = datetime.now()
+            sent_at = datetime.now(timezone.utc)
             await db.record_followup_sent(
                 message_id=message_id,
                 stage=stage,
@@ -316,27 +445,91 @@ class SMTPSender:
             )
             return True
         else:
-            # Increment failure counter
-            new_count = await db.increment_failed_sends(message_id)
+            # Increment failure counter and stop the thread at the limit
+            # in a single statement
+            result = await db.record_send_failure(message_id, self.max_failed_sends)
+            new_count = result['failed_sends'] if result else None
             logger.warning(
                 f"Failed to send Stage {stage} follow-up for thread {message_id}. "
                 f"Failed sends: {new_count}"
             )
             
-            # Check if we've hit the limit
             if new_count and new_count >= self.max_failed_sends:
                 logger.error(
                     f"Thread {message_id} reached max failed sends ({new_count}), "
-                    f"marking as ERROR"
-                )
-                await db.update_thread(
-                    message_id,
-                    status='ERROR',
-                    stop_reason='MAX_SEND_FAILURES'
+                    f"stop_reason={result['stop_reason']}"
                 )
             
             return False
 
+    
+    async def send_many(
+        self,
+        jobs: List[Tuple[Dict, int]],
+        concurrency: int = SEND_CONCURRENCY
+    ) -> List:
+        """
+        Send many follow-ups concurrently with bounded parallelism.
+        
+        At most `concurrency` sends (capped at MAX_SEND_CONCURRENCY) run at
+        once overall, and at most SMTP_POOL_SIZE per sending account so
+        Gmail does not throttle the account and every in-flight send can
+        use a pooled session.
+        
+        Args:
+            jobs: (thread_data, stage) pairs, as passed to send_followup
+            concurrency: Max sends in flight across all accounts
+            
+        Returns:
+            Per-job results in input order: True/False from send_followup,
+            or the exception it raised
+        """
+        global_sem = asyncio.Semaphore(min(concurrency, MAX_SEND_CONCURRENCY))
+        account_sems: Dict[str, asyncio.Semaphore] = {}
+        
+        async def send_one(thread_data: Dict, stage: int) -> bool:
+            account_sem = account_sems.setdefault(
+                thread_data['account_email'], asyncio.Semaphore(SMTP_POOL_SIZE)
+            )
+            async with account_sem, global_sem:
+                return await self.send_followup(thread_data, stage)
+        
+        return await asyncio.gather(
+            *(send_one(thread_data, stage) for thread_data, stage in jobs),
+            return_exceptions=True
+        )
+    
+    async def send_followups_bulk(self, items: List[Tuple[Dict, int]]) -> List[bool]:
+        """
+        Send many follow-ups over pooled per-account SMTP sessions.
+        
+        Sends run through send_many, so each account uses at most
+        SMTP_POOL_SIZE sessions (one STARTTLS + AUTH each) for the whole
+        batch. Each follow-up keeps send_followup's own retry, failure
+        counting and database recording.
+        
+        Args:
+            items: (thread_data, stage) pairs, as passed to send_followup
+            
+        Returns:
+            Per-item success flags, in input order
+        """
+        results = await self.send_many(items)
+        
+        flags = []
+        for (thread_data, stage), result in zip(items, results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    f"Error sending Stage {stage} follow-up for "
+                    f"{thread_data.get('message_id')}: {result}",
+                    exc_info=result
+                )
+                flags.append(False)
+            else:
+                flags.append(result)
+        
+        return flags
+
 
 # Global sender instance
 sender = SMTPSender()
@@ -5,44 +5,79 @@ Provides a single rotating log file with daily rotation and 30-day retention.
 Logs all key events: email received, intent classified, follow-up sent, stopped.
 """
 
+import atexit
 import logging
 import os
-from logging.handlers import TimedRotatingFileHandler
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from pathlib import Path
+from typing import Dict, List
 
 
-def setup_logger(
-    name: str = None,
-    log_level: str = 'INFO',
-    log_file: str = 'logs/application.log'
-) -> logging.Logger:
+class RateLimitedExceptionFilter(logging.Filter):
     """
-    Configure and return a logger with rotating file handler.
+    Suppress repeated tracebacks from the same failure site.
     
-    Creates a logger that writes to a single log file with daily rotation
-    and 30-day retention. Also outputs to console for development.
+    Formatting a traceback is expensive; during error spikes (e.g. a DB
+    restart) the same exception can be logged hundreds of times a minute.
+    The first max_per_window records per (exception type, file, line) in each
+    window keep their traceback; later ones are logged as a single line with
+    a suppression count. Records are never dropped.
+    """
+    
+    def __init__(self, max_per_window: int = 10, window_seconds: float = 60.0):
+        super().__init__()
+        self.max_per_window = max_per_window
+        self.window_seconds = window_seconds
+        self._counts = {}
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not record.exc_info or record.exc_info[0] is None:
+            return True
+        
+        key = (record.exc_info[0], record.pathname, record.lineno)
+        now = time.monotonic()
+        window_start, count = self._counts.get(key, (now, 0))
+        
+        if now - window_start > self.window_seconds:
+            window_start, count = now, 0
+        
+        count += 1
+        self._counts[key] = (window_start, count)
+        
+        if count > self.max_per_window:
+            record.msg = (
+                f"{record.getMessage()} (traceback suppressed, "
+                f"{count} occurrences in last {self.window_seconds:.0f}s)"
+            )
+            record.args = None
+            record.exc_info = None
+            record.exc_text = None
+        
+        return True
+
+
+# Shared so limits apply per failure site across all module loggers
+_exception_filter = RateLimitedExceptionFilter()
+
+
+# One background writer per log file: loggers only enqueue records, and
+# the listener thread does the file and console I/O
+_queue_handlers: Dict[str, QueueHandler] = {}
+_listeners: List[QueueListener] = []
+
+
+def _create_handlers(log_file: str) -> List[logging.Handler]:
+    """
+    Create the file and console handlers for a log file.
     
     Args:
-        name: Logger name (uses root logger if None)
-        log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Path to log file
         
     Returns:
-        Configured logger instance
+        Handlers to run on the listener thread
     """
-    # Create logs directory if it doesn't exist
-    log_path = Path(log_file)
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    logger = logging.getLogger(name)
-    
-    if logger.handlers:
-        return logger
-    
-    # Set log level
-    level = getattr(logging, log_level.upper(), logging.INFO)
-    logger.setLevel(level)
-    
     # Create formatter
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -68,17 +103,88 @@ def setup_logger(
         return f"{base_filename}-{date_part}.log"
     
     file_handler.namer = namer
-    file_handler.setLevel(level)
     file_handler.setFormatter(formatter)
+    handlers = [file_handler]
+    
+    # Create console handler (set LOG_CONSOLE=0 in production to skip the
+    # second format pass and write for every record)
+    if os.getenv('LOG_CONSOLE', '1') == '1':
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+    
+    return handlers
+
+
+def _get_queue_handler(log_file: str) -> QueueHandler:
+    """
+    Return the queue handler feeding log_file, starting its listener once.
     
-    # Create console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(level)
-    console_handler.setFormatter(formatter)
+    Args:
+        log_file: Path to log file
+        
+    Returns:
+        QueueHandler shared by every logger writing to log_file
+    """
+    queue_handler = _queue_handlers.get(log_file)
+    if queue_handler is None:
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *_create_handlers(log_file))
+        listener.start()
+        _listeners.append(listener)
+        
+        queue_handler = QueueHandler(log_queue)
+        _queue_handlers[log_file] = queue_handler
+    
+    return queue_handler
+
+
+@atexit.register
+def _stop_listeners():
+    """Flush queued records and stop the listener threads at exit."""
+    for listener in _listeners:
+        listener.stop()
+    _listeners.clear()
+
+
+def setup_logger(
+    name: str = None,
+    log_level: str = 'INFO',
+    log_file: str = 'logs/application.log'
+) -> logging.Logger:
+    """
+    Configure and return a logger with rotating file handler.
     
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    Creates a logger that writes to a single log file with daily rotation
+    and 30-day retention. Also outputs to console unless LOG_CONSOLE=0.
+    Records are handed to a background thread, so logging never blocks
+    the event loop on file or console I/O.
+    
+    Args:
+        name: Logger name (uses root logger if None)
+        log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        log_file: Path to log file
+        
+    Returns:
+        Configured logger instance
+    """
+    # Create logs directory if it doesn't exist
+    log_path = Path(log_file)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    logger = logging.getLogger(name)
+    
+    if logger.handlers:
+        return logger
+    
+    # Set log level
+    level = getattr(logging, log_level.upper(), logging.INFO)
+    logger.setLevel(level)
+    
+    logger.addHandler(_get_queue_handler(log_file))
+    
+    # Logger-level filter so each record is counted once, not once per handler
+    logger.addFilter(_exception_filter)
     
     # Prevent propagation to root logger
     logger.propagate = False
@@ -124,8 +230,8 @@ def log_email_received(message_id: str, creator_email: str, account_email: str):
         account_email: Account that received the email
     """
     app_logger.info(
-        f"Email received | message_id={message_id} | "
-        f"from={creator_email} | account={account_email}"
+        "Email received | message_id=%s | from=%s | account=%s",
+        message_id, creator_email, account_email
     )
 
 
@@ -139,8 +245,8 @@ def log_intent_classified(message_id: str, intent: str, has_contact: bool):
         has_contact: Whether contact details were detected
     """
     app_logger.info(
-        f"Intent classified | message_id={message_id} | "
-        f"intent={intent} | has_contact={has_contact}"
+        "Intent classified | message_id=%s | intent=%s | has_contact=%s",
+        message_id, intent, has_contact
     )
 
 
@@ -154,8 +260,8 @@ def log_followup_sent(message_id: str, stage: int, creator_email: str):
         creator_email: Creator's email address
     """
     app_logger.info(
-        f"Follow-up sent | message_id={message_id} | "
-        f"stage={stage} | to={creator_email}"
+        "Follow-up sent | message_id=%s | stage=%s | to=%s",
+        message_id, stage, creator_email
     )
 
 
@@ -169,8 +275,8 @@ def log_followup_scheduled(message_id: str, stage: int, delay_hours: int):
         delay_hours: Hours until follow-up should be sent
     """
     app_logger.info(
-        f"Follow-up scheduled | message_id={message_id} | "
-        f"stage={stage} | delay_hours={delay_hours}"
+        "Follow-up scheduled | message_id=%s | stage=%s | delay_hours=%s",
+        message_id, stage, delay_hours
     )
 
 
@@ -183,7 +289,7 @@ def log_automation_stopped(message_id: str, reason: str):
         reason: Reason for stopping (CONTACT_PROVIDED, REPLIED, etc.)
     """
     app_logger.info(
-        f"Automation stopped | message_id={message_id} | reason={reason}"
+        "Automation stopped | message_id=%s | reason=%s", message_id, reason
     )
 
 
@@ -196,7 +302,7 @@ def log_delegated_to_human(message_id: str, reason: str):
         reason: Reason for delegation
     """
     app_logger.info(
-        f"Delegated to human | message_id={message_id} | reason={reason}"
+        "Delegated to human | message_id=%s | reason=%s", message_id, reason
     )
 
 
@@ -209,8 +315,12 @@ def log_error(message_id: str, error: str, context: str = None):
         error: Error message
         context: Additional context about the error
     """
-    context_str = f" | context={context}" if context else ""
-    app_logger.error(
-        f"Processing error | message_id={message_id} | "
-        f"error={error}{context_str}"
-    )
+    if context:
+        app_logger.error(
+            "Processing error | message_id=%s | error=%s | context=%s",
+            message_id, error, context
+        )
+    else:
+        app_logger.error(
+            "Processing error | message_id=%s | error=%s", message_id, error
+        )
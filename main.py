@@ -5,9 +5,8 @@ Run with: python main.py
 Or with uv: uv run python main.py
 """
 
-import asyncio
-from app.main import main
+from app.main import run
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run()
@@ -0,0 +1,38 @@
+"""Tests for IMAPController connection handling."""
+
+import asyncio
+from collections import namedtuple
+
+import aioimaplib
+
+from app.imap.controller import IMAPController
+
+
+Response = namedtuple('Response', 'result lines')
+
+
+class TimingOutClient:
+    """Answers SELECT but times out on every search, like a dead session."""
+    
+    async def select(self, folder):
+        return Response('OK', [])
+    
+    async def uid_search(self, criteria):
+        raise aioimaplib.CommandTimeout('UID SEARCH')
+
+
+def test_dead_connection_is_dropped_on_lookup():
+    controller = IMAPController()
+    email = next(iter(controller.accounts))
+    
+    async def ensure_connection(account_email):
+        return TimingOutClient()
+    
+    controller._ensure_connection = ensure_connection
+    controller._selected[email] = 'INBOX'
+    controller._last_noop[email] = 0.0
+    
+    assert asyncio.run(controller.mark_as_read(email, '<m1@example.com>')) is False
+    assert controller.connections[email] is None
+    assert email not in controller._selected
+    assert email not in controller._last_noop
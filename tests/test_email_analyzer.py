@@ -0,0 +1,93 @@
+"""Tests for the rule-based fast path of the email analyzer."""
+
+import pytest
+
+from app.ml.email_analyzer import (
+    AnalysisCache,
+    EmailAnalyzer,
+    INTENT_CONTACT_PROVIDED,
+    INTENT_INTERESTED,
+    INTENT_NOT_INTERESTED
+)
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return EmailAnalyzer()
+
+
+@pytest.mark.parametrize('body, intent', [
+    ("No thanks", INTENT_NOT_INTERESTED),
+    ("Not interested, thank you.", INTENT_NOT_INTERESTED),
+    ("I'll pass", INTENT_NOT_INTERESTED),
+    ("Yes, I'm interested!", INTENT_INTERESTED),
+    ("Sounds good", INTENT_INTERESTED),
+    ("  yes  ", INTENT_INTERESTED),
+])
+def test_whole_phrase_replies_are_fast_classified(analyzer, body, intent):
+    result = analyzer._fast_classify(body)
+    
+    assert result is not None
+    assert result['intent'] == intent
+    assert result['phone_numbers'] == []
+
+
+@pytest.mark.parametrize('body', [
+    "I'm not really interested",
+    "Not currently interested, thanks",
+    "I'm no longer interested",
+    "Sorry, not at this time. Yes I saw it but no.",
+    "Yes I saw it, but I'm not interested",
+    "Interested in other brands, not this one",
+    "Sounds good but we have no budget",
+])
+def test_negated_or_mixed_replies_go_to_llm(analyzer, body):
+    assert analyzer._fast_classify(body) is None
+
+
+def test_questions_go_to_llm(analyzer):
+    assert analyzer._fast_classify("Interested?") is None
+
+
+def test_bare_phone_number_is_contact(analyzer):
+    result = analyzer._fast_classify("Call me on +1 415 555 2671")
+    
+    assert result['intent'] == INTENT_CONTACT_PROVIDED
+    assert result['has_phone'] is True
+    assert result['phone_numbers'] == ['+14155552671']
+
+
+def test_phone_number_with_other_text_goes_to_llm(analyzer):
+    assert analyzer._fast_classify("Don't call me on +1 415 555 2671") is None
+
+
+def test_result_is_not_shared_between_calls(analyzer):
+    first = analyzer._fast_classify("+1 415 555 2671")
+    first['phone_numbers'].append('mutated')
+    
+    assert analyzer._fast_classify("+1 415 555 2671")['phone_numbers'] == ['+14155552671']
+
+
+@pytest.mark.parametrize('phone, e164', [
+    ("+1 415 555 2671", "+14155552671"),
+    ("(415) 555-2671", "+14155552671"),
+    ("+44 20 7946 0958", "+442079460958"),
+    ("020 7946 0958", "+442079460958"),
+    ("98765 43210", "+919876543210"),
+    ("0412 345 678", "+61412345678"),
+])
+def test_phone_numbers_in_local_formats_are_kept(analyzer, phone, e164):
+    assert analyzer._validate_phone_numbers([phone]) == [e164]
+
+
+@pytest.mark.parametrize('phone', ["N/A", "not provided", "123", ""])
+def test_non_numbers_are_rejected(analyzer, phone):
+    assert analyzer._validate_phone_numbers([phone]) == []
+
+
+def test_cache_key_ignores_case_and_spacing_only():
+    key = AnalysisCache.key
+    
+    assert key('No  thanks') == key('no thanks')
+    assert key('Interested?') != key('Interested.')
+    assert key('+44 7700 900123') != key('44 7700 900123')
@@ -0,0 +1,108 @@
+"""Tests for splitting multi-message FETCH responses."""
+
+from app.imap.parser import split_fetch_response
+
+
+HEADER = b"Message-ID: <m1@example.com>\r\nSubject: Re: Hi\r\n\r\n"
+TEXT = b"Sounds good, let's talk.\r\n"
+
+
+def test_single_literal_is_returned_as_is():
+    literal = bytearray(HEADER + TEXT)
+    lines = [
+        b'1 FETCH (UID 42 BODY[] {%d}' % len(literal),
+        literal,
+        b')',
+        b'Fetch completed.',
+    ]
+    
+    [(key, meta, body)] = split_fetch_response(lines)
+    
+    assert key == '42'
+    assert body is literal
+    assert meta.startswith(b'1 FETCH (UID 42')
+
+
+def test_header_and_text_reassemble_in_either_order():
+    header_first = [
+        b'1 FETCH (UID 7 BODY[HEADER] {%d}' % len(HEADER),
+        HEADER,
+        b' BODY[TEXT]<0> {%d}' % len(TEXT),
+        TEXT,
+        b')',
+    ]
+    text_first = [
+        b'1 FETCH (UID 7 BODY[TEXT]<0> {%d}' % len(TEXT),
+        TEXT,
+        b' BODY[HEADER] {%d}' % len(HEADER),
+        HEADER,
+        b')',
+    ]
+    
+    for lines in (header_first, text_first):
+        [(key, _, body)] = split_fetch_response(lines)
+        assert key == '7'
+        assert body == HEADER + TEXT
+
+
+def test_sequence_number_used_without_uid():
+    lines = [b'3 FETCH (BODY[] {%d}' % len(TEXT), TEXT, b')']
+    
+    [(key, _, body)] = split_fetch_response(lines)
+    
+    assert key == '3'
+    assert body == TEXT
+
+
+def test_uid_announced_after_literal_is_found():
+    lines = [b'3 FETCH (BODY[] {%d}' % len(TEXT), TEXT, b' UID 99)']
+    
+    [(key, meta, _)] = split_fetch_response(lines)
+    
+    assert key == '99'
+    assert b'UID 99' in meta
+
+
+def test_multiple_messages_keep_response_order():
+    lines = []
+    for seq, uid in ((1, 10), (2, 11), (3, 12)):
+        body = b'body %d\r\n' % uid
+        lines += [b'%d FETCH (UID %d BODY[] {%d}' % (seq, uid, len(body)), body, b')']
+    lines.append(b'Fetch completed.')
+    
+    result = split_fetch_response(lines)
+    
+    assert [key for key, _, _ in result] == ['10', '11', '12']
+    assert [body for _, _, body in result] == [b'body 10\r\n', b'body 11\r\n', b'body 12\r\n']
+
+
+def test_literal_is_sliced_to_announced_size():
+    lines = [b'1 FETCH (UID 5 BODY[] {4}', b'abcdEXTRA', b')']
+    
+    [(_, _, body)] = split_fetch_response(lines)
+    
+    assert body == b'abcd'
+
+
+def test_literal_that_looks_like_fetch_line_is_not_a_new_message():
+    body = b'2 FETCH (UID 6 BODY[] {3}'
+    lines = [b'1 FETCH (UID 5 BODY[] {%d}' % len(body), body, b')']
+    
+    [(key, _, result)] = split_fetch_response(lines)
+    
+    assert key == '5'
+    assert result == body
+
+
+def test_lines_before_first_message_are_ignored():
+    lines = [b'* OK still here', b'1 FETCH (UID 8 BODY[] {2}', b'hi', b')']
+    
+    [(key, _, body)] = split_fetch_response(lines)
+    
+    assert key == '8'
+    assert body == b'hi'
+
+
+def test_empty_response():
+    assert split_fetch_response([]) == []
+    assert split_fetch_response([b'Fetch completed.']) == []
@@ -0,0 +1,260 @@
+"""Tests for IMAPWatcher's batched fetch and UID high-water mark."""
+
+import asyncio
+from collections import namedtuple
+from types import SimpleNamespace
+
+import pytest
+
+from app.imap import watcher as watcher_module
+from app.imap.watcher import IMAPWatcher
+
+
+Response = namedtuple('Response', 'result lines')
+
+
+def _message(uid: int):
+    header = (
+        f"Message-ID: <m{uid}@example.com>\r\n"
+        f"In-Reply-To: <outreach{uid}@example.com>\r\n"
+        f"From: Creator <creator{uid}@example.com>\r\n"
+        f"Subject: Re: Collaboration\r\n\r\n"
+    ).encode()
+    text = f"Reply number {uid}\r\n".encode()
+    return header, text
+
+
+class FakeTransport:
+    def __init__(self):
+        self.closed = False
+    
+    def is_closing(self):
+        return self.closed
+    
+    def close(self):
+        self.closed = True
+
+
+class FakeIMAPClient:
+    """Serves a fixed set of UIDs and fails the FETCH of chosen UIDs."""
+    
+    def __init__(self, uids, fail_uid=None, fail_with=None):
+        self.uids = uids
+        self.fail_uid = fail_uid
+        self.fail_with = fail_with
+        self.searches = []
+        self.protocol = SimpleNamespace(transport=FakeTransport())
+    
+    async def uid_search(self, criteria):
+        self.searches.append(criteria)
+        return Response('OK', [b' '.join(str(uid).encode() for uid in self.uids)])
+    
+    async def uid(self, command, uid_set, items):
+        uids = [int(uid) for uid in uid_set.split(',')]
+        envelope = 'HEADER.FIELDS' in items
+        
+        if not envelope and self.fail_uid in uids:
+            if self.fail_with is not None:
+                raise self.fail_with
+            return Response('NO', [b'FETCH failed'])
+        
+        lines = []
+        for seq, uid in enumerate(uids, 1):
+            header, text = _message(uid)
+            if envelope:
+                lines += [
+                    f'{seq} FETCH (UID {uid} BODY[HEADER.FIELDS (FROM)] {{{len(header)}}}'.encode(),
+                    header,
+                    b')'
+                ]
+            else:
+                lines += [
+                    f'{seq} FETCH (UID {uid} BODY[HEADER] {{{len(header)}}}'.encode(),
+                    header,
+                    f' BODY[TEXT]<0> {{{len(text)}}}'.encode(),
+                    text,
+                    b')'
+                ]
+        lines.append(b'Success')
+        return Response('OK', lines)
+
+
+@pytest.fixture
+def make_watcher(monkeypatch):
+    # Two messages per FETCH batch so a handful of UIDs spans several batches
+    monkeypatch.setattr(watcher_module, 'FETCH_BATCH_SIZE', 2)
+    
+    def make(client):
+        watcher = IMAPWatcher()
+        
+        async def ensure_connection(account):
+            watcher.connections[account.email] = client
+            return client
+        
+        watcher.ensure_connection = ensure_connection
+        return watcher
+    
+    return make
+
+
+def _uids(emails):
+    return [int(e['imap_uid']) for e in emails]
+
+
+def test_fetch_returns_all_batches_and_advances_mark(make_watcher):
+    client = FakeIMAPClient([1, 2, 3, 4, 5])
+    watcher = make_watcher(client)
+    account = watcher.accounts[0]
+    
+    emails = asyncio.run(watcher.fetch_new_replies(account, '01-Jan-2024'))
+    
+    assert _uids(emails) == [1, 2, 3, 4, 5]
+    assert emails[0]['body'] == 'Reply number 1'
+    assert watcher.highest_seen_uid[account.email] == 5
+
+
+def test_failed_batch_keeps_mark_below_unreturned_emails(make_watcher):
+    client = FakeIMAPClient([1, 2, 3, 4, 5], fail_uid=3)
+    watcher = make_watcher(client)
+    account = watcher.accounts[0]
+    
+    emails = asyncio.run(watcher.fetch_new_replies(account, '01-Jan-2024'))
+    
+    assert _uids(emails) == [1, 2]
+    assert watcher.highest_seen_uid[account.email] == 2
+    
+    # The next cycle searches from just above the returned emails
+    client.fail_uid = None
+    emails = asyncio.run(watcher.fetch_new_replies(account, '01-Jan-2024'))
+    
+    assert client.searches[-1].startswith('UID 3:* ')
+    assert _uids(emails) == [3, 4, 5]
+
+
+def test_fetch_error_does_not_advance_mark(make_watcher):
+    client = FakeIMAPClient([1, 2, 3, 4, 5], fail_uid=3, fail_with=OSError('reset'))
+    watcher = make_watcher(client)
+    account = watcher.accounts[0]
+    
+    emails = asyncio.run(watcher.fetch_new_replies(account, '01-Jan-2024'))
+    
+    # The batch parsed before the error is returned, nothing past it is skipped
+    assert _uids(emails) == [1, 2]
+    assert watcher.highest_seen_uid[account.email] == 2
+    assert watcher.connections[account.email] is None
+    assert client.protocol.transport.closed
+
+
+def test_deadline_returns_partial_results(make_watcher, monkeypatch):
+    client = FakeIMAPClient([1, 2, 3, 4, 5])
+    watcher = make_watcher(client)
+    account = watcher.accounts[0]
+    
+    # Each deadline check advances the watcher's clock by one second
+    ticks = iter(range(100))
+    monkeypatch.setattr(
+        watcher_module, 'time', SimpleNamespace(monotonic=lambda: next(ticks))
+    )
+    
+    emails = asyncio.run(watcher.fetch_new_replies(account, '01-Jan-2024', deadline=1.5))
+    
+    # Two batches start before the deadline; the third waits for next cycle
+    assert _uids(emails) == [1, 2, 3, 4]
+    assert watcher.highest_seen_uid[account.email] == 4
+
+
+class FakeRedis:
+    def __init__(self):
+        self.hashes = {}
+    
+    async def hset(self, key, mapping):
+        self.hashes[key] = dict(mapping)
+
+
+def test_persisted_mark_waits_for_processing(make_watcher):
+    client = FakeIMAPClient([1, 2, 3, 4, 5])
+    watcher = make_watcher(client)
+    watcher.redis_client = FakeRedis()
+    account = watcher.accounts[0]
+    key = watcher.UID_STATE_KEY.format(email=account.email)
+    
+    emails = asyncio.run(watcher.fetch_new_replies(account, '01-Jan-2024'))
+    
+    # Fetched but unprocessed: a restart must fetch all of them again
+    assert watcher.highest_seen_uid[account.email] == 5
+    assert watcher.redis_client.hashes[key]['uid'] == 0
+    
+    async def process(uids):
+        for parsed in emails:
+            if int(parsed['imap_uid']) in uids:
+                await watcher.mark_processed(parsed)
+    
+    asyncio.run(process({1, 2, 4}))
+    assert watcher.redis_client.hashes[key]['uid'] == 2
+    
+    asyncio.run(process({3, 5}))
+    assert watcher.redis_client.hashes[key]['uid'] == 5
+
+
+@pytest.mark.parametrize('subject', ['Re: hi', 'FW: hi', 'Fwd: hi', 'AW: Hallo', 'SV: Hej', 'TR: Salut', 'Antw: Hoi'])
+def test_reply_prefixes_are_matched_and_searched(subject):
+    prefix = subject.split(' ')[0]
+    
+    assert watcher_module._REPLY_PREFIX_RE.match(subject)
+    assert f'SUBJECT "{prefix}"'.lower() in watcher_module._REPLY_SEARCH_KEYS.lower()
+
+
+def test_reply_search_keys_are_balanced():
+    tokens = watcher_module._REPLY_SEARCH_KEYS.split()
+    
+    assert tokens.count('OR') == len(watcher_module._REPLY_KEYS) - 1
+
+
+def test_failed_email_is_fetched_again(make_watcher):
+    client = FakeIMAPClient([1, 2, 3])
+    watcher = make_watcher(client)
+    watcher.redis_client = FakeRedis()
+    account = watcher.accounts[0]
+    key = watcher.UID_STATE_KEY.format(email=account.email)
+    
+    async def cycle(failed):
+        emails = await watcher.fetch_new_replies(account, '01-Jan-2024')
+        for parsed in emails:
+            if int(parsed['imap_uid']) in failed:
+                await watcher.mark_failed(parsed)
+            else:
+                await watcher.mark_processed(parsed)
+        return _uids(emails)
+    
+    assert asyncio.run(cycle({2})) == [1, 2, 3]
+    assert watcher.redis_client.hashes[key]['uid'] == 1
+    
+    # Below the search floor, but re-fetched by UID ahead of new mail
+    client.uids = [1, 2, 3, 4]
+    assert asyncio.run(cycle({2})) == [2, 4]
+    assert watcher.redis_client.hashes[key]['uid'] == 1
+    
+    # The last allowed attempt fails too, so the email is left for a human
+    assert asyncio.run(cycle({2})) == [2]
+    assert asyncio.run(cycle(set())) == []
+    assert watcher.redis_client.hashes[key]['uid'] == 4
+
+
+@pytest.mark.parametrize('fail_uid, expected', [(3, [1, 2]), (5, [1, 2, 3, 4])])
+def test_failed_parse_keeps_earlier_batches(make_watcher, fail_uid, expected):
+    client = FakeIMAPClient([1, 2, 3, 4, 5])
+    watcher = make_watcher(client)
+    account = watcher.accounts[0]
+    parse_batch = watcher._parse_batch
+    
+    async def failing_parse(email, is_gmail, messages):
+        if any(int(uid) == fail_uid for uid, _, _ in messages):
+            raise RuntimeError('parse failed')
+        return await parse_batch(email, is_gmail, messages)
+    
+    watcher._parse_batch = failing_parse
+    
+    emails = asyncio.run(watcher.fetch_new_replies(account, '01-Jan-2024'))
+    
+    assert _uids(emails) == expected
+    assert watcher.highest_seen_uid[account.email] == expected[-1]